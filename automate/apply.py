@@ -1,15 +1,38 @@
 import asyncio
+import contextlib
+import json
 import os
+import random
+import re
+import sqlite3
 import logging
+import threading
 import time
+from collections import deque
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 import aiohttp
 import openai
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import async_playwright, Page, Locator
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # optional: faster event loop when installed
+    uvloop = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional: keyword automaton for quick responses
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding of Notion pages
+    orjson = None
+
 load_dotenv()
 
 # Configure logging
@@ -23,6 +46,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _build_phrase_automaton(categories: Dict[str, List[str]]):
+    """Aho-Corasick automaton mapping each phrase to its category, or None without pyahocorasick"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for category, phrases in categories.items():
+        for phrase in phrases:
+            if phrase not in automaton:  # first (highest-priority) category keeps a shared phrase
+                automaton.add_word(phrase, category)
+    automaton.make_automaton()
+    return automaton
+
 @dataclass
 class GreenhouseJob:
     """Data class for Greenhouse job applications"""
@@ -39,9 +74,43 @@ class GreenhouseAutomation:
         self.session = None
         self.browser = None
         self.context = None
+        # Abort image, font, media and tracker requests. Chromium turns the HTTP
+        # cache off while any route is installed, so set this to False to keep
+        # the profile's cached scripts and styles warm across jobs instead
+        self.block_heavy_requests = True
+        
+        # Jobs run concurrently on one context; keep terminal prompts one at a time
+        self._confirm_lock = asyncio.Lock()
+        # Set when the user quits at a prompt; run_automation cancels the other jobs
+        self._stop_event = asyncio.Event()
+        # Jobs the user confirmed; a quit lets these finish submitting and recording
+        self._confirmed_jobs: set = set()
+        
+        # Notion status updates waiting to be sent together
+        self._status_queue: List[tuple] = []
+        self._status_flush_size = 5
+        # Notion allows about 3 requests per second per integration
+        self._notion_semaphore = asyncio.Semaphore(3)
+        
+        # Job list from the last complete Notion query, reused by runs within the TTL
+        self._notion_cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.notion_cache.db')
+        self._notion_cache_ttl = 300
+        
+        # Warm pages reset to about:blank and handed to the next job
+        self._page_pool: deque = deque()
+        self._page_pool_size = 4
         
         # Initialize OpenAI
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.openai_client = openai.AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        
+        # Proactive OpenAI throttling: cap in-flight requests and space request starts
+        # (0.06s ~= 1000 RPM; tune to the account's limit)
+        self._ai_semaphore = asyncio.Semaphore(10)
+        self._ai_min_interval = 0.06
+        self._ai_next_slot = 0.0
+        
+        # Answers to recurring questions, shared across jobs: (normalized question, field tag) -> answer
+        self._ai_cache: Dict[tuple, str] = {}
         
         # Your professional background (customize this!)
         self.professional_profile = {
@@ -67,6 +136,35 @@ class GreenhouseAutomation:
             'input[data-filled="true"]'
         ]
         
+        # Polled in-page by wait_for_function: indicator hit and filled-field count
+        # together, truthy once Simplify looks done
+        self._simplify_ready_js = f"""
+            () => {{
+                const detected = document.querySelector({json.dumps(', '.join(self.simplify_indicators))}) !== null;
+                let filled = 0;
+                document.querySelectorAll('input[type="text"], input[type="email"], textarea, select').forEach(input => {{
+                    if (input.value && input.value.trim().length > 0) {{
+                        filled++;
+                    }}
+                }});
+                return detected || filled >= 3 ? {{ detected, filled }} : null;
+            }}
+        """
+        
+        # Simplify autofill button selectors
+        self.simplify_button_selectors = [
+            'button:has-text("Autofill this page")',
+            'button:has-text("Autofill")',
+            '[aria-label*="Autofill"]',
+            '[title*="Autofill"]',
+            '.simplify-autofill-button',
+            'button[class*="simplify"]',
+            'div[id*="simplify"] button',
+            'iframe[src*="simplify"] button',
+            'button:has-text("Fill")',
+            'button:has-text("Auto Fill")'
+        ]
+        
         # Submit button selectors
         self.submit_selectors = [
             'button[type="submit"]:has-text("Submit Application")',
@@ -93,6 +191,21 @@ class GreenhouseAutomation:
             '.success-message'
         ]
         
+        # Button selectors split into plain CSS plus the lowercase :has-text needle, so
+        # the page can try them in priority order within one evaluate. A merged union
+        # would take the first match in document order, which can be the page's own
+        # "Autofill with MyGreenhouse" ahead of Simplify's injected button
+        self._simplify_button_specs = self._button_specs(self.simplify_button_selectors)
+        self._submit_specs = self._button_specs(self.submit_selectors)
+        self._success_css = ", ".join(
+            f':text("{s[len("text="):]}")' if s.startswith('text=') else s
+            for s in self.success_indicators
+        )
+        # The application page is usable once either of these is rendered
+        self._page_ready_css = 'form input, form textarea, :text("You have already applied")'
+        # Post-submit redirect that also counts as success
+        self._success_url_re = re.compile(r'thank|success|confirmation', re.I)
+        
         # Default values for common fields
         self.default_values = {
             'cover_letter': """Dear Hiring Manager,
@@ -151,10 +264,30 @@ Best regards""",
         headers = {
             'Authorization': f'Bearer {self.notion_token}',
             'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28'
+            'Notion-Version': '2022-06-28',
+            'Accept-Encoding': 'gzip'
         }
-        self.session = aiohttp.ClientSession(headers=headers)
+        # Keep TCP/TLS connections to Notion warm across the query and status updates
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=75)
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
 
+    # Server-side query filter: only rows with an Apply URL whose Type reads
+    # greenhouse. rich_text 'equals' is case-sensitive, so the spellings the
+    # case-insensitive check below accepts are listed; that check still runs
+    _GREENHOUSE_FILTER = {
+        'and': [
+            {'property': 'Apply URL', 'url': {'is_not_empty': True}},
+            {'or': [
+                {'property': 'Type', 'rich_text': {'equals': spelling}}
+                for spelling in ('Greenhouse', 'greenhouse', 'GreenHouse', 'GREENHOUSE')
+            ]}
+        ]
+    }
+    
     # Gets GreenHouse Jobs from Database
     async def get_greenhouse_jobs(self) -> List[GreenhouseJob]:
         """Get Greenhouse jobs from Notion database"""
@@ -162,77 +295,73 @@ Best regards""",
         
         jobs = []
         
+        # sqlite is blocking, so cache reads and writes run on a worker thread
+        cached = await asyncio.to_thread(self._load_cached_jobs)
+        if cached is not None:
+            logger.info(f"Using {len(cached)} cached Greenhouse jobs (fetched under {self._notion_cache_ttl}s ago)")
+            return cached
+        
         try:
-            logger.info("Fetching all jobs from database for debugging...")
+            logger.info("Fetching Greenhouse jobs from database...")
             logger.info(f"Using database ID: {self.database_id}")
             
-            async with self.session.post(url, json={}) as response:
-                logger.info(f"Response status: {response.status}")
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Failed to fetch jobs: {response.status}")
-                    logger.error(f"Error response: {error_text}")
-                    return jobs
-                
-                data = await response.json()
-                all_results = data.get('results', [])
-                logger.info(f"Total jobs in database: {len(all_results)}")
-                
-                if len(all_results) == 0:
-                    logger.warning("No results found in database!")
-                    return jobs
-                
-                # Debug: Print first few jobs
-                for i, result in enumerate(all_results[:5]):
-                    props = result.get('properties', {})
-                    logger.info(f"\n--- Job {i+1} Debug Info ---")
-                    
-                    title_prop = props.get('Job Title', {})
-                    title = ""
-                    if title_prop.get('title') and len(title_prop['title']) > 0:
-                        title = title_prop['title'][0]['text']['content']
-                    logger.info(f"Title: '{title}'")
-                    
-                    company_prop = props.get('Company', {})
-                    company = ""
-                    if company_prop.get('rich_text') and len(company_prop['rich_text']) > 0:
-                        company = company_prop['rich_text'][0]['text']['content']
-                    logger.info(f"Company: '{company}'")
-                    
-                    type_prop = props.get('Type', {})
-                    type_value = ""
-                    if type_prop.get('rich_text') and len(type_prop['rich_text']) > 0:
-                        type_value = type_prop['rich_text'][0]['text']['content']
-                    logger.info(f"Type: '{type_value}' (looking for 'greenhouse')")
+            # Notion returns at most 100 rows per query; follow next_cursor and
+            # filter each page as it arrives instead of buffering every result
+            payload = {'page_size': 100, 'filter': self._GREENHOUSE_FILTER}
+            debug = logger.isEnabledFor(logging.DEBUG)
+            total_results = 0
+            
+            while True:
+                async with self.session.post(url, json=payload) as response:
+                    logger.info(f"Response status: {response.status}")
                     
-                    apply_url_prop = props.get('Apply URL', {})
-                    apply_url = apply_url_prop.get('url', '')
-                    logger.info(f"Apply URL: '{apply_url}' (has URL: {bool(apply_url)})")
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error(f"Failed to fetch jobs: {response.status}")
+                        logger.error(f"Error response: {error_text}")
+                        break
                     
-                    logger.info(f"Available properties: {list(props.keys())}")
+                    if orjson is not None:
+                        data = orjson.loads(await response.read())
+                    else:
+                        data = await response.json()
                 
-                # Filter for Greenhouse jobs
-                greenhouse_jobs = []
-                for result in all_results:
+                # Per-job debug details are only built when DEBUG logging is enabled
+                for result in data.get('results', []):
                     props = result.get('properties', {})
+                    type_value = self._rich_text(props.get('Type', {})).lower()
                     
-                    type_prop = props.get('Type', {})
-                    type_value = ""
-                    if type_prop.get('rich_text') and len(type_prop['rich_text']) > 0:
-                        type_value = type_prop['rich_text'][0]['text']['content']
+                    if debug and total_results < 5:
+                        apply_url = props.get('Apply URL', {}).get('url', '')
+                        logger.debug(f"\n--- Job {total_results+1} Debug Info ---")
+                        logger.debug(f"Title: '{self._rich_text(props.get('Job Title', {}), 'title')}'")
+                        logger.debug(f"Company: '{self._rich_text(props.get('Company', {}))}'")
+                        logger.debug(f"Type: '{type_value}' (looking for 'greenhouse')")
+                        logger.debug(f"Apply URL: '{apply_url}' (has URL: {bool(apply_url)})")
+                        logger.debug(f"Available properties: {list(props.keys())}")
+                    total_results += 1
                     
-                    apply_url_prop = props.get('Apply URL', {})
-                    apply_url = apply_url_prop.get('url', '')
+                    if type_value != "greenhouse":
+                        continue
                     
-                    if type_value.lower() == "greenhouse" and apply_url:
-                        job = self._parse_greenhouse_job(result)
-                        if job:
-                            greenhouse_jobs.append(job)
-                            logger.info(f"✅ Found Greenhouse job: {job.title} at {job.company}")
+                    job = self._parse_greenhouse_job(result)
+                    if job:
+                        jobs.append(job)
+                        logger.info(f"✅ Found Greenhouse job: {job.title} at {job.company}")
                 
-                logger.info(f"\nFound {len(greenhouse_jobs)} Greenhouse jobs to process")
-                return greenhouse_jobs
+                if not data.get('has_more') or not data.get('next_cursor'):
+                    # Only a full read of every page is worth caching
+                    await asyncio.to_thread(self._store_cached_jobs, jobs)
+                    break
+                payload['start_cursor'] = data['next_cursor']
+            
+            logger.info(f"Matching jobs in database: {total_results}")
+            if total_results == 0:
+                logger.warning("No Greenhouse jobs with an Apply URL found in database!")
+                return jobs
+            
+            logger.info(f"\nFound {len(jobs)} Greenhouse jobs to process")
+            return jobs
                 
         except Exception as e:
             logger.error(f"Error fetching Greenhouse jobs: {e}")
@@ -240,31 +369,71 @@ Best regards""",
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return jobs
     
+    def _notion_cache(self) -> sqlite3.Connection:
+        """Open the on-disk job cache, creating its table on first use"""
+        conn = sqlite3.connect(self._notion_cache_path)
+        conn.execute('CREATE TABLE IF NOT EXISTS jobs (db TEXT PRIMARY KEY, fetched REAL, payload TEXT)')
+        return conn
+    
+    def _load_cached_jobs(self) -> Optional[List[GreenhouseJob]]:
+        """Jobs from a query of this database within the TTL, else None"""
+        try:
+            with contextlib.closing(self._notion_cache()) as conn:
+                row = conn.execute(
+                    'SELECT payload FROM jobs WHERE db = ? AND fetched > ?',
+                    (self.database_id, time.time() - self._notion_cache_ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Notion cache unavailable: {e}")
+            return None
+        if row is None:
+            return None
+        try:
+            return [GreenhouseJob(**job) for job in json.loads(row[0])]
+        except (ValueError, TypeError) as e:
+            # Corrupt row, or one written before a GreenhouseJob field change
+            logger.debug(f"Discarding unreadable Notion cache entry: {e}")
+            self._invalidate_cached_jobs()
+            return None
+    
+    def _store_cached_jobs(self, jobs: List[GreenhouseJob]):
+        """Remember this query's jobs for later runs"""
+        try:
+            with contextlib.closing(self._notion_cache()) as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO jobs (db, fetched, payload) VALUES (?, ?, ?)',
+                    (self.database_id, time.time(), json.dumps([asdict(job) for job in jobs]))
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Could not write Notion cache: {e}")
+    
+    def _invalidate_cached_jobs(self):
+        """Drop this database's cached jobs so the next query sees fresh statuses"""
+        try:
+            with contextlib.closing(self._notion_cache()) as conn, conn:
+                conn.execute('DELETE FROM jobs WHERE db = ?', (self.database_id,))
+        except sqlite3.Error as e:
+            logger.debug(f"Could not clear Notion cache: {e}")
+    
+    @staticmethod
+    def _rich_text(prop: Dict, key: str = 'rich_text') -> str:
+        """Return the text of the first segment of a Notion rich_text/title property"""
+        segments = prop.get(key) or ()
+        return segments[0]['text']['content'] if segments else ""
+    
     def _parse_greenhouse_job(self, result: Dict) -> Optional[GreenhouseJob]:
         """Parse Notion result into GreenhouseJob"""
         try:
             props = result.get('properties', {})
             
-            title_prop = props.get('Job Title', {})
-            title = ""
-            if title_prop.get('title'):
-                title = title_prop['title'][0]['text']['content']
-            
-            company_prop = props.get('Company', {})
-            company = ""
-            if company_prop.get('rich_text'):
-                company = company_prop['rich_text'][0]['text']['content']
-            
-            apply_link_prop = props.get('Apply URL', {})
-            apply_link = apply_link_prop.get('url', '')
-            
+            apply_link = props.get('Apply URL', {}).get('url', '')
             if not apply_link:
                 return None
             
             return GreenhouseJob(
                 id=result['id'],
-                title=title,
-                company=company,
+                title=self._rich_text(props.get('Job Title', {}), 'title'),
+                company=self._rich_text(props.get('Company', {})),
                 apply_link=apply_link
             )
             
@@ -274,6 +443,9 @@ Best regards""",
     
     async def setup_browser(self):
         """Initialize browser with existing profile and load Simplify extension"""
+        if self.context:
+            return self.context
+        
         playwright = await async_playwright().start()
         
         self.browser = await playwright.chromium.launch_persistent_context(
@@ -290,6 +462,8 @@ Best regards""",
         )
         
         self.context = self.browser
+        if self.block_heavy_requests:
+            await self.context.route(self._BLOCKED_URL_RE, self._abort_request)
         logger.info("Browser initialized with existing profile and Simplify extension")
         
         await asyncio.sleep(3)
@@ -316,49 +490,94 @@ Best regards""",
         finally:
             await page.close()
     
+    # Neither autofill nor submit detection needs these. Stylesheets stay:
+    # the button lookups and the hidden-field checks depend on them. Playwright
+    # matches a regex route inside the driver, so only these requests reach Python
+    _BLOCKED_URL_RE = re.compile(
+        r'\.(?:png|jpe?g|gif|webp|avif|svg|ico|bmp|woff2?|ttf|otf|eot|mp4|webm|ogg|mp3|wav|m4a)(?:[?#]|$)'
+        r'|google-analytics\.com|googletagmanager\.com|doubleclick\.net|segment\.(?:io|com)|hotjar\.com',
+        re.I
+    )
+    
+    @staticmethod
+    async def _abort_request(route):
+        """Abort a request matched by _BLOCKED_URL_RE"""
+        await route.abort()
+    
+    async def _acquire_page(self) -> Page:
+        """Take a warm page from the pool, opening a new one if it is empty"""
+        while self._page_pool:
+            page = self._page_pool.popleft()
+            # A pooled page can crash or be closed while idle; drop it
+            if not page.is_closed():
+                return page
+        return await self.context.new_page()
+    
+    async def _release_page(self, page: Page):
+        """Reset a finished page and keep it for the next job, or close it if the pool is full"""
+        if len(self._page_pool) < self._page_pool_size and not page.is_closed():
+            try:
+                await page.goto('about:blank')
+                self._page_pool.append(page)
+                return
+            except Exception as e:
+                logger.debug(f"Could not reset page for reuse: {e}")
+        # Runs from a job's finally block, so a crashed page mustn't raise here
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Could not close page: {e}")
+    
+    @staticmethod
+    def _button_specs(selectors: List[str]) -> List[Dict[str, str]]:
+        """Split each selector into its CSS part and lowercase :has-text needle"""
+        specs = []
+        for selector in selectors:
+            match = re.fullmatch(r'(.*):has-text\("(.+)"\)', selector)
+            css, text = (match.group(1), match.group(2).lower()) if match else (selector, '')
+            specs.append({'css': css, 'text': text})
+        return specs
+    
+    # First visible, enabled match in selector priority order
+    _FIND_BUTTON_JS = """
+        (specs) => {
+            const visible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+            for (const spec of specs) {
+                for (const el of document.querySelectorAll(spec.css)) {
+                    if (spec.text && !el.textContent.replace(/\\s+/g, ' ').toLowerCase().includes(spec.text)) continue;
+                    if (!el.disabled && visible(el)) return el;
+                }
+            }
+            return null;
+        }
+    """
+    
     async def trigger_simplify_autofill(self, page: Page) -> bool:
         """Actively trigger Simplify's autofill button"""
         logger.info("Looking for Simplify autofill button...")
         
-        simplify_button_selectors = [
-            'button:has-text("Autofill this page")',
-            'button:has-text("Autofill")',
-            '[aria-label*="Autofill"]',
-            '[title*="Autofill"]',
-            '.simplify-autofill-button',
-            'button[class*="simplify"]',
-            'div[id*="simplify"] button',
-            'iframe[src*="simplify"] button',
-            'button:has-text("Fill")',
-            'button:has-text("Auto Fill")'
-        ]
-        
-        await asyncio.sleep(3)
-        
-        for selector in simplify_button_selectors:
-            try:
-                button = await page.query_selector(selector)
-                if button and await button.is_visible():
-                    logger.info(f"Found Simplify button with selector: {selector}")
-                    await button.click()
-                    logger.info("✅ Clicked Simplify autofill button!")
-                    return True
-            except Exception as e:
-                logger.debug(f"Selector {selector} failed: {e}")
-                continue
+        # The browser re-runs the lookup until the extension injects its button, so
+        # there is no fixed delay before looking and no re-polling from here
+        try:
+            button = await page.wait_for_function(self._FIND_BUTTON_JS, arg=self._simplify_button_specs, timeout=8000)
+            await button.as_element().click()
+            logger.info("✅ Clicked Simplify autofill button!")
+            return True
+        except PlaywrightTimeoutError:
+            logger.debug("Simplify button did not appear on the page")
+        except Exception as e:
+            logger.debug(f"Simplify button lookup failed: {e}")
         
         try:
             frames = page.frames
             for frame in frames:
                 try:
                     if 'simplify' in frame.url.lower():
-                        for selector in simplify_button_selectors:
-                            button = await frame.query_selector(selector)
-                            if button and await button.is_visible():
-                                logger.info(f"Found Simplify button in iframe: {selector}")
-                                await button.click()
-                                logger.info("✅ Clicked Simplify autofill button in iframe!")
-                                return True
+                        button = (await frame.evaluate_handle(self._FIND_BUTTON_JS, self._simplify_button_specs)).as_element()
+                        if button:
+                            await button.click()
+                            logger.info("✅ Clicked Simplify autofill button in iframe!")
+                            return True
                 except:
                     continue
         except:
@@ -371,51 +590,34 @@ Best regards""",
         """Wait for Simplify to autofill the form"""
         logger.info("Waiting for Simplify to autofill form...")
         
-        start_time = time.time()
+        deadline = time.time() + timeout
         
-        while time.time() - start_time < timeout:
+        # The browser polls the check itself; we only hear back once it passes
+        while time.time() < deadline:
             try:
-                for indicator in self.simplify_indicators:
-                    element = await page.query_selector(indicator)
-                    if element:
-                        logger.info(f"Simplify detected via selector: {indicator}")
-                        return True
-                
-                filled_inputs = await page.evaluate("""
-                    () => {
-                        const inputs = document.querySelectorAll('input[type="text"], input[type="email"], textarea, select');
-                        let filledCount = 0;
-                        inputs.forEach(input => {
-                            if (input.value && input.value.trim().length > 0) {
-                                filledCount++;
-                            }
-                        });
-                        return filledCount;
-                    }
-                """)
-                
-                if filled_inputs >= 3:
-                    logger.info(f"Detected {filled_inputs} filled fields - assuming Simplify completed")
-                    return True
+                remaining_ms = (deadline - time.time()) * 1000
+                handle = await page.wait_for_function(self._simplify_ready_js, polling=500, timeout=remaining_ms)
+                probe = await handle.json_value()
                 
-                await asyncio.sleep(1)
+                if probe['detected']:
+                    logger.info("Simplify detected via indicator selectors")
+                else:
+                    logger.info(f"Detected {probe['filled']} filled fields - assuming Simplify completed")
+                return True
                 
+            except PlaywrightTimeoutError:
+                break
             except Exception as e:
+                # e.g. the page navigated mid-wait; try again for the time left
                 logger.warning(f"Error checking Simplify status: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(0.5)
         
         logger.warning("Simplify autofill timeout - proceeding anyway")
         return False
     
-    async def generate_intelligent_response(self, question: str, field_context: dict, job: GreenhouseJob) -> str:
-        """Use OpenAI to generate intelligent responses to application questions"""
-        try:
-            quick_response = self._get_quick_response(question, field_context)
-            if quick_response:
-                logger.info(f"✅ Used quick response for: '{question[:50]}...'")
-                return quick_response
-            
-            prompt = f"""You are filling out a job application. Generate CONCISE, DIRECT responses. Follow these strict rules:
+    def _response_prompt_header(self, job: GreenhouseJob) -> str:
+        """Shared rules, job details and profile for every answer prompt"""
+        return f"""You are filling out a job application. Generate CONCISE, DIRECT responses. Follow these strict rules:
 
 RESPONSE RULES:
 1. For dropdown/select fields: Give 1-3 words maximum (e.g., "Yes", "Bachelor's", "3-5 years")
@@ -433,97 +635,215 @@ APPLICANT PROFILE:
 - Experience: {self.professional_profile['experience']}
 - Skills: {self.professional_profile['skills']}
 - Education: {self.professional_profile['education']}
-
+"""
+    
+    @contextlib.asynccontextmanager
+    async def _openai_rate_limit(self):
+        """Hold an OpenAI request slot, waiting for the next free start time"""
+        async with self._ai_semaphore:
+            now = asyncio.get_running_loop().time()
+            slot = max(now, self._ai_next_slot)
+            self._ai_next_slot = slot + self._ai_min_interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            yield
+    
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
+    def _ai_cache_key(self, question: str, field_context: dict) -> tuple:
+        """Normalize a question so rephrased whitespace/case hits the same cache entry"""
+        return (self._WHITESPACE_RE.sub(' ', question.strip().lower())[:200], field_context.get('tag', ''))
+    
+    def _cache_ai_response(self, key: tuple, answer: str, job: GreenhouseJob):
+        """Remember an answer unless it names this job, which would leak into other applications"""
+        answer_lower = answer.lower()
+        # An empty company/title would match every answer, so only check the ones we have
+        for name in (job.company, job.title):
+            if name and name.lower() in answer_lower:
+                return
+        self._ai_cache[key] = answer
+    
+    # True once the filled-field count is unchanged between two polls
+    _AUTOFILL_SETTLED_JS = """
+        () => {
+            const filled = Array.from(document.querySelectorAll('input[type="text"], input[type="email"], textarea, select'))
+                .filter(input => input.value && input.value.trim().length > 0).length;
+            const settled = filled === window.__autofillFilledCount;
+            window.__autofillFilledCount = filled;
+            return settled;
+        }
+    """
+    
+    async def wait_for_autofill_to_settle(self, page: Page, timeout: int = 2):
+        """Wait until Simplify stops filling fields, up to `timeout` seconds"""
+        try:
+            await page.wait_for_function(self._AUTOFILL_SETTLED_JS, polling=300, timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            logger.debug("Autofill still changing fields - continuing")
+    
+    async def generate_intelligent_response(self, question: str, field_context: dict, job: GreenhouseJob) -> str:
+        """Use OpenAI to generate intelligent responses to application questions"""
+        try:
+            quick_response = self._get_quick_response(question, field_context, job)
+            if quick_response:
+                logger.info(f"✅ Used quick response for: '{question[:50]}...'")
+                return quick_response
+            
+            cache_key = self._ai_cache_key(question, field_context)
+            if cache_key in self._ai_cache:
+                logger.info(f"✅ Used cached AI response for: '{question[:50]}...'")
+                return self._ai_cache[cache_key]
+            
+            prompt = f"""{self._response_prompt_header(job)}
 FIELD TYPE: {field_context.get('tag', 'unknown')}
 QUESTION: {question}
 
 Generate a CONCISE, appropriate response:"""
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a concise job application assistant. Give direct, spartan responses with no fluff."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
+            async with self._openai_rate_limit():
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a concise job application assistant. Give direct, spartan responses with no fluff."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=200,
+                    temperature=0
+                )
             
             answer = response.choices[0].message.content.strip()
+            self._cache_ai_response(cache_key, answer, job)
             logger.info(f"✅ Generated AI response for: '{question[:50]}...'")
             return answer
             
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
-            return self._get_quick_response(question, field_context) or "See resume for details"
+            return self._get_quick_response(question, field_context, job) or "See resume for details"
     
-    def _get_quick_response(self, question: str, field_context: dict) -> Optional[str]:
-        """Fast rule-based responses for common question patterns"""
-        question_lower = question.lower()
-        field_type = field_context.get('tag', '').lower()
-        
-        # Salary questions - always 90,000
-        if any(word in question_lower for word in ['salary', 'compensation', 'pay', 'wage', 'expected pay']):
-            if '$' in question or 'dollar' in question_lower:
-                return "$90,000"
-            return "90000"
-        
-        # Start date / availability - always 2 weeks
-        if any(phrase in question_lower for phrase in [
-            'start date', 'available to start', 'begin work', 'earliest start', 
-            'when can you start', 'availability', 'available to begin',
-            'start immediately', 'notice period', 'when available'
-        ]):
-            return "2 weeks"
-        
-        # Work authorization - Yes
-        if any(phrase in question_lower for phrase in [
-            'authorized to work', 'work authorization', 'legal right to work',
-            'eligible to work', 'visa', 'work permit', 'citizen', 'green card'
-        ]):
-            return "Yes"
-        
-        # Willing to relocate
-        if any(phrase in question_lower for phrase in [
-            'willing to relocate', 'relocate', 'move to', 'open to relocation'
-        ]):
-            return "Yes"
-        
-        # Travel requirements
-        if any(phrase in question_lower for phrase in [
-            'willing to travel', 'travel required', 'travel up to'
-        ]):
-            return "Yes"
-        
-        # Background check / drug test
-        if any(phrase in question_lower for phrase in [
-            'background check', 'drug test', 'screening', 'background screening'
-        ]):
-            return "Yes"
+    async def generate_batch_responses(self, fields: List[dict], job: GreenhouseJob) -> Dict[int, str]:
+        """Answer several application questions with one OpenAI request.
+
+        Returns answers keyed by position in `fields`. Questions covered by the
+        quick rules never reach the API; a lone question uses the single-field path.
+        """
+        answers = {}
+        pending = []
+        for i, field in enumerate(fields):
+            quick_response = self._get_quick_response(field['question'], field, job)
+            if quick_response:
+                logger.info(f"✅ Used quick response for: '{field['question'][:50]}...'")
+                answers[i] = quick_response
+                continue
+            
+            cached = self._ai_cache.get(self._ai_cache_key(field['question'], field))
+            if cached:
+                logger.info(f"✅ Used cached AI response for: '{field['question'][:50]}...'")
+                answers[i] = cached
+            else:
+                pending.append(i)
         
-        # Years of experience
-        if any(phrase in question_lower for phrase in [
-            'years of experience', 'how many years', 'experience in'
-        ]):
-            return "3-5 years"
+        if len(pending) == 1:
+            i = pending[0]
+            answers[i] = await self.generate_intelligent_response(fields[i]['question'], fields[i], job)
+            return answers
+        if not pending:
+            return answers
         
-        # Education level
-        if any(phrase in question_lower for phrase in [
-            'education level', 'degree', 'education background'
-        ]):
-            return "Bachelor's degree"
+        questions = "\n".join(
+            f"- id {i} ({fields[i].get('tag', 'unknown')}): {fields[i]['question']}" for i in pending
+        )
+        prompt = f"""{self._response_prompt_header(job)}
+QUESTIONS:
+{questions}
+
+Return a JSON object mapping each question id (as a string) to its CONCISE, appropriate response."""
+
+        try:
+            async with self._openai_rate_limit():
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a concise job application assistant. Give direct, spartan responses with no fluff. Reply with JSON only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=200 * len(pending),
+                    temperature=0,
+                    response_format={"type": "json_object"}
+                )
+            generated = json.loads(response.choices[0].message.content)
+            logger.info(f"✅ Generated {len(pending)} AI responses in one request")
+        except Exception as e:
+            logger.error(f"Error generating batched AI responses: {e}")
+            generated = {}
         
-        # Cover letter or why interested (spartan version)
-        if any(phrase in question_lower for phrase in [
-            'cover letter', 'why interested', 'why apply', 'why this position'
-        ]):
-            return f"I am interested in this {job.title} role at {job.company} because it aligns with my technical background and career goals. My experience in software development makes me a strong fit for this position."
+        for i in pending:
+            answer = generated.get(str(i))
+            if isinstance(answer, str) and answer.strip():
+                answers[i] = answer.strip()
+                self._cache_ai_response(self._ai_cache_key(fields[i]['question'], fields[i]), answers[i], job)
+            else:
+                answers[i] = self._get_fallback_response(fields[i]['question'], fields[i], job)
+        return answers
+    
+    # Quick-response trigger phrases, in priority order
+    _QUICK_RESPONSE_PHRASES = {
+        'salary': ['salary', 'compensation', 'pay', 'wage', 'expected pay'],
+        'start_date': ['start date', 'available to start', 'begin work', 'earliest start',
+                       'when can you start', 'availability', 'available to begin',
+                       'start immediately', 'notice period', 'when available'],
+        'work_authorization': ['authorized to work', 'work authorization', 'legal right to work',
+                               'eligible to work', 'visa', 'work permit', 'citizen', 'green card'],
+        'relocation': ['willing to relocate', 'relocate', 'move to', 'open to relocation'],
+        'travel': ['willing to travel', 'travel required', 'travel up to'],
+        'screening': ['background check', 'drug test', 'screening', 'background screening'],
+        'experience': ['years of experience', 'how many years', 'experience in'],
+        'education': ['education level', 'degree', 'education background'],
+        'cover_letter': ['cover letter', 'why interested', 'why apply', 'why this position'],
+        'references': ['references', 'provide references', 'reference available'],
+    }
+    # One zero-width lookahead per category so a single scan reports every category
+    # present; the earliest alternative wins at each position, like the old if-chain
+    _QUICK_RESPONSE_RE = re.compile("|".join(
+        f"(?=(?P<{category}>{'|'.join(map(re.escape, phrases))}))"
+        for category, phrases in _QUICK_RESPONSE_PHRASES.items()
+    ))
+    _QUICK_RESPONSE_PRIORITY = {category: i for i, category in enumerate(_QUICK_RESPONSE_PHRASES)}
+    # Preferred when pyahocorasick is installed: one pass whatever the number of phrases
+    _QUICK_RESPONSE_AUTOMATON = _build_phrase_automaton(_QUICK_RESPONSE_PHRASES)
+    _QUICK_RESPONSES = {
+        'start_date': "2 weeks",
+        'work_authorization': "Yes",
+        'relocation': "Yes",
+        'travel': "Yes",
+        'screening': "Yes",
+        'experience': "3-5 years",
+        'education': "Bachelor's degree",
+        'references': "Available upon request",
+    }
+    
+    def _get_quick_response(self, question: str, field_context: dict, job: GreenhouseJob) -> Optional[str]:
+        """Fast rule-based responses for common question patterns"""
+        question_lower = question.lower()
+        field_type = field_context.get('tag', '').lower()
         
-        # References available
-        if any(phrase in question_lower for phrase in [
-            'references', 'provide references', 'reference available'
-        ]):
-            return "Available upon request"
+        if self._QUICK_RESPONSE_AUTOMATON is not None:
+            categories = {category for _, category in self._QUICK_RESPONSE_AUTOMATON.iter(question_lower)}
+        else:
+            categories = {m.lastgroup for m in self._QUICK_RESPONSE_RE.finditer(question_lower)}
+        if categories:
+            category = min(categories, key=self._QUICK_RESPONSE_PRIORITY.__getitem__)
+            
+            # Salary questions - always 90,000
+            if category == 'salary':
+                if '$' in question or 'dollar' in question_lower:
+                    return "$90,000"
+                return "90000"
+            
+            # Cover letter or why interested (spartan version)
+            if category == 'cover_letter':
+                return f"I am interested in this {job.title} role at {job.company} because it aligns with my technical background and career goals. My experience in software development makes me a strong fit for this position."
+            
+            return self._QUICK_RESPONSES[category]
         
         # For dropdowns/selects
         if field_type == 'select':
@@ -536,11 +856,11 @@ Generate a CONCISE, appropriate response:"""
         
         return None
     
-    def _get_fallback_response(self, question: str, field_context: dict) -> str:
+    def _get_fallback_response(self, question: str, field_context: dict, job: GreenhouseJob) -> str:
         """Spartan fallback responses if OpenAI fails"""
         question_lower = question.lower()
         
-        quick = self._get_quick_response(question, field_context)
+        quick = self._get_quick_response(question, field_context, job)
         if quick:
             return quick
         
@@ -562,9 +882,54 @@ Generate a CONCISE, appropriate response:"""
         fields_filled = 0
         
         try:
-            empty_required_fields = await page.evaluate("""
-                () => {
+            # Collect empty required fields and fill the ones matching a known pattern
+            # with its default value, all inside the page in one round trip
+            scan = await page.evaluate("""
+                ({patterns, defaults}) => {
                     const fields = [];
+                    const patternFilled = [];
+                    
+                    // Pick a select option in the page so only the choice crosses back,
+                    // not every option of long country/experience lists
+                    const chooseOption = (select) => {
+                        const options = Array.from(select.options);
+                        if (options.length <= 1) return null;
+                        const context = `${select.name || ''} ${select.placeholder || ''}`.toLowerCase();
+                        const pick = (kind, test) => {
+                            const option = options.find(test);
+                            return option ? { kind, value: option.value, text: option.text } : null;
+                        };
+                        
+                        let choice = null;
+                        if (context.includes('country')) {
+                            choice = pick('country', o => o.text.toLowerCase().includes('united states') || o.text.toLowerCase().includes('us'));
+                        } else if (context.includes('experience') || context.includes('years')) {
+                            choice = pick('experience', o => ['2-5', '3-5', '1-3'].some(range => o.text.includes(range)));
+                        } else if (context.includes('education') || context.includes('degree')) {
+                            choice = pick('education', o => o.text.toLowerCase().includes('bachelor') || o.text.toLowerCase().includes('master'));
+                        }
+                        return choice || pick('default option', o => o !== options[0] && o.value !== '');
+                    };
+                    
+                    // Each reported field is stamped with its own attribute so Python can
+                    // locate exactly that element; clear stamps left by an earlier scan
+                    document.querySelectorAll('[data-ajf-idx]').forEach(element => element.removeAttribute('data-ajf-idx'));
+                    
+                    // First element each pattern selector resolves to; earlier patterns win
+                    const patternFor = new Map();
+                    for (const [key, selectors] of Object.entries(patterns)) {
+                        for (const selector of selectors) {
+                            let element = null;
+                            try {
+                                element = document.querySelector(selector);
+                            } catch (e) {
+                                continue;  // Playwright-only syntax such as :has-text
+                            }
+                            if (element && !patternFor.has(element)) {
+                                patternFor.set(element, key);
+                            }
+                        }
+                    }
                     
                     const requiredElements = document.querySelectorAll(
                         'input[required], textarea[required], select[required], ' +
@@ -593,6 +958,28 @@ Generate a CONCISE, appropriate response:"""
                                 question = element.placeholder || element.name || 'Please provide information';
                             }
                             
+                            const patternKey = patternFor.get(element);
+                            if (patternKey) {
+                                // Native setter + events so framework-controlled inputs see the change;
+                                // taken from the built-in prototype, since custom-element subclasses
+                                // don't define 'value' on their own prototype
+                                const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+                                    : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+                                    : HTMLInputElement.prototype;
+                                const setter = Object.getOwnPropertyDescriptor(proto, 'value')?.set;
+                                if (setter) {
+                                    setter.call(element, defaults[patternKey]);
+                                } else {
+                                    element.value = defaults[patternKey];
+                                }
+                                element.dispatchEvent(new Event('input', { bubbles: true }));
+                                element.dispatchEvent(new Event('change', { bubbles: true }));
+                                patternFilled.push(patternKey);
+                                return;
+                            }
+                            
+                            const stamp = String(fields.length);
+                            element.setAttribute('data-ajf-idx', stamp);
                             fields.push({
                                 tag: element.tagName.toLowerCase(),
                                 type: element.type || '',
@@ -602,44 +989,56 @@ Generate a CONCISE, appropriate response:"""
                                 className: element.className || '',
                                 ariaLabel: element.getAttribute('aria-label') || '',
                                 question: question.trim(),
-                                selector: element.name ? `[name="${element.name}"]` : `[id="${element.id}"]`
+                                // Unique even for shared radio names or controls with no name/id
+                                selector: `[data-ajf-idx="${stamp}"]`,
+                                choice: element.tagName === 'SELECT' ? chooseOption(element) : null
                             });
                         }
                     });
                     
-                    return fields;
+                    return { fields, patternFilled };
                 }
-            """)
+            """, {'patterns': self.field_patterns, 'defaults': self.default_values})
             
-            logger.info(f"Found {len(empty_required_fields)} empty required fields")
+            empty_required_fields = scan['fields']
+            logger.info(f"Found {len(empty_required_fields) + len(scan['patternFilled'])} empty required fields")
             
+            for pattern_type in scan['patternFilled']:
+                logger.info(f"✅ Filled {pattern_type} field with default value")
+            fields_filled += len(scan['patternFilled'])
+            
+            # Text questions are answered in a single AI request; every other field
+            # goes through the select/checkbox/generic handlers
+            ai_fields = []
+            other_fields = []
             for field in empty_required_fields:
                 logger.info(f"Processing field: {field['question']}")
-                
-                filled = await self._fill_field_by_pattern(page, field)
-                if filled:
+                if (field['tag'] in ['input', 'textarea'] and field['type'] in ['text', 'email', '']
+                        and len(field['question'].strip()) >= 3):
+                    ai_fields.append(field)
+                else:
+                    other_fields.append(field)
+            
+            async def answer_ai_fields():
+                if not ai_fields:
+                    return {}
+                logger.info(f"🤖 Generating AI responses for {len(ai_fields)} fields")
+                return await self.generate_batch_responses(ai_fields, job)
+            
+            # Only the AI request runs alongside the fills: fill/type focus the
+            # element and then send keystrokes, and the page has one focus, so
+            # the fills themselves go one at a time
+            answers_task = asyncio.ensure_future(answer_ai_fields())
+            try:
+                for field in other_fields:
+                    await self._fill_handled_field(page.locator(field['selector']), field)
                     fields_filled += 1
-                    continue
-                
-                if field['tag'] == 'select':
-                    filled = await self._fill_select_field(page, field)
-                    if filled:
-                        fields_filled += 1
-                        continue
-                
-                if field['type'] == 'checkbox':
-                    filled = await self._fill_checkbox_field(page, field)
-                    if filled:
-                        fields_filled += 1
-                        continue
-                
-                if field['tag'] in ['input', 'textarea'] and field['type'] in ['text', 'email', '']:
-                    filled = await self._fill_with_ai(page, field, job)
-                    if filled:
-                        fields_filled += 1
-                        continue
-                
-                await self._fill_generic_field(page, field)
+                answers = await answers_task
+            finally:
+                answers_task.cancel()
+            
+            for i, field in enumerate(ai_fields):
+                await self._fill_ai_field(page.locator(field['selector']), field, answers[i])
                 fields_filled += 1
             
             logger.info(f"✅ Filled {fields_filled} missing required fields")
@@ -649,159 +1048,130 @@ Generate a CONCISE, appropriate response:"""
             logger.error(f"Error filling missing fields: {e}")
             return False
     
-    async def _fill_with_ai(self, page: Page, field: dict, job: GreenhouseJob) -> bool:
-        """Fill text field using AI-generated response"""
+    # Fail fast on a control that is gone instead of the 30s default action timeout
+    _FIELD_ACTION_TIMEOUT = 5000
+    
+    async def _fill_handled_field(self, element: Locator, field: dict):
+        """Fill a non-AI field: select or checkbox handler first, generic content otherwise"""
+        if field['tag'] == 'select' and await self._fill_select_field(element, field):
+            return
+        if field['type'] == 'checkbox' and await self._fill_checkbox_field(element, field):
+            return
+        await self._fill_generic_field(element, field)
+    
+    async def _fill_ai_field(self, element: Locator, field: dict, ai_response: str):
+        """Fill a text field with its AI response, falling back to generic content"""
+        if not await self._fill_with_ai(element, field, ai_response):
+            await self._fill_generic_field(element, field)
+    
+    async def _fill_with_ai(self, element: Locator, field: dict, ai_response: str) -> bool:
+        """Fill text field with a pre-generated AI response"""
         try:
-            question = field['question']
-            if not question or len(question.strip()) < 3:
-                return False
-            
-            logger.info(f"🤖 Generating AI response for: '{question}'")
-            
-            ai_response = await self.generate_intelligent_response(question, field, job)
-            
-            selector = field['selector']
-            element = await page.query_selector(selector)
-            
-            if element:
-                await element.fill(ai_response)
-                logger.info(f"✅ Filled field with AI response (length: {len(ai_response)})")
-                return True
-            else:
-                logger.warning(f"Could not find element with selector: {selector}")
-                return False
+            await element.fill(ai_response, timeout=self._FIELD_ACTION_TIMEOUT)
+            logger.info(f"✅ Filled field with AI response (length: {len(ai_response)})")
+            return True
                 
+        except PlaywrightTimeoutError:
+            logger.warning(f"Could not find element with selector: {field['selector']}")
+            return False
         except Exception as e:
             logger.error(f"Error filling field with AI: {e}")
             return False
     
-    async def _fill_field_by_pattern(self, page: Page, field: dict) -> bool:
-        """Fill field based on known patterns"""
-        field_text = f"{field['name']} {field['placeholder']} {field['ariaLabel']}".lower()
-        
-        for pattern_type, selectors in self.field_patterns.items():
-            for selector in selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        element_name = await element.get_attribute('name') or ''
-                        element_id = await element.get_attribute('id') or ''
-                        element_placeholder = await element.get_attribute('placeholder') or ''
-                        
-                        if (element_name == field['name'] or 
-                            element_id == field['id'] or
-                            (element_placeholder and element_placeholder == field['placeholder'])):
-                            
-                            await element.fill(self.default_values[pattern_type])
-                            logger.info(f"✅ Filled {pattern_type} field with default value")
-                            return True
-                except:
-                    continue
-        
-        return False
-    
-    async def _fill_select_field(self, page: Page, field: dict) -> bool:
+    async def _fill_select_field(self, select_element: Locator, field: dict) -> bool:
         """Fill select dropdown with appropriate option"""
         try:
-            selector = f"select[name='{field['name']}']" if field['name'] else f"select[id='{field['id']}']"
-            select_element = await page.query_selector(selector)
-            
-            if not select_element:
+            # The option was chosen in the page by the required-field scan
+            choice = field['choice']
+            if not choice:
                 return False
             
-            options = await page.evaluate(f"""
-                () => {{
-                    const select = document.querySelector("{selector}");
-                    if (!select) return [];
-                    return Array.from(select.options).map(option => ({{
-                        value: option.value,
-                        text: option.text
-                    }}));
-                }}
-            """)
-            
-            if not options or len(options) <= 1:
-                return False
-            
-            field_context = f"{field['name']} {field['placeholder']}".lower()
-            
-            if 'country' in field_context:
-                for option in options:
-                    if 'united states' in option['text'].lower() or 'us' in option['text'].lower():
-                        await select_element.select_option(option['value'])
-                        logger.info(f"✅ Selected country: {option['text']}")
-                        return True
-            
-            elif 'experience' in field_context or 'years' in field_context:
-                for option in options:
-                    if '2-5' in option['text'] or '3-5' in option['text'] or '1-3' in option['text']:
-                        await select_element.select_option(option['value'])
-                        logger.info(f"✅ Selected experience: {option['text']}")
-                        return True
-            
-            elif 'education' in field_context or 'degree' in field_context:
-                for option in options:
-                    if 'bachelor' in option['text'].lower() or 'master' in option['text'].lower():
-                        await select_element.select_option(option['value'])
-                        logger.info(f"✅ Selected education: {option['text']}")
-                        return True
-            
-            for option in options[1:]:
-                if option['value'] and option['value'] != '':
-                    await select_element.select_option(option['value'])
-                    logger.info(f"✅ Selected default option: {option['text']}")
-                    return True
+            await select_element.select_option(choice['value'], timeout=self._FIELD_ACTION_TIMEOUT)
+            logger.info(f"✅ Selected {choice['kind']}: {choice['text']}")
+            return True
             
         except Exception as e:
             logger.warning(f"Error filling select field: {e}")
             
         return False
     
-    async def _fill_checkbox_field(self, page: Page, field: dict) -> bool:
+    async def _fill_checkbox_field(self, checkbox: Locator, field: dict) -> bool:
         """Fill checkbox fields (usually terms and conditions)"""
         try:
-            selector = f"input[name='{field['name']}']" if field['name'] else f"input[id='{field['id']}']"
-            checkbox = await page.query_selector(selector)
-            
-            if checkbox:
-                field_context = f"{field['name']} {field['placeholder']} {field['ariaLabel']}".lower()
-                if any(term in field_context for term in ['terms', 'condition', 'agree', 'consent', 'privacy']):
-                    await checkbox.check()
-                    logger.info("✅ Checked terms/conditions checkbox")
-                    return True
+            field_context = f"{field['name']} {field['placeholder']} {field['ariaLabel']}".lower()
+            if any(term in field_context for term in ['terms', 'condition', 'agree', 'consent', 'privacy']):
+                await checkbox.check(timeout=self._FIELD_ACTION_TIMEOUT)
+                logger.info("✅ Checked terms/conditions checkbox")
+                return True
                     
         except Exception as e:
             logger.warning(f"Error filling checkbox: {e}")
             
         return False
     
-    async def _fill_generic_field(self, page: Page, field: dict):
+    async def _fill_generic_field(self, element: Locator, field: dict):
         """Fill any remaining field with generic content"""
         try:
-            selector = f"input[name='{field['name']}']" if field['name'] else f"input[id='{field['id']}']"
-            element = await page.query_selector(selector)
+            field_context = f"{field['name']} {field['placeholder']}".lower()
             
-            if element:
-                field_context = f"{field['name']} {field['placeholder']}".lower()
-                
-                if 'phone' in field_context:
-                    await element.fill("555-123-4567")
-                elif 'linkedin' in field_context:
-                    await element.fill("https://linkedin.com/in/yourprofile")
-                elif 'github' in field_context:
-                    await element.fill("https://github.com/yourusername")
-                elif 'website' in field_context or 'portfolio' in field_context:
-                    await element.fill("https://yourportfolio.com")
-                else:
-                    await element.fill("Please see resume for details")
-                
-                logger.info(f"✅ Filled generic field: {field['name']}")
+            if 'phone' in field_context:
+                value = "555-123-4567"
+            elif 'linkedin' in field_context:
+                value = "https://linkedin.com/in/yourprofile"
+            elif 'github' in field_context:
+                value = "https://github.com/yourusername"
+            elif 'website' in field_context or 'portfolio' in field_context:
+                value = "https://yourportfolio.com"
+            else:
+                value = "Please see resume for details"
+            
+            await element.fill(value, timeout=self._FIELD_ACTION_TIMEOUT)
+            logger.info(f"✅ Filled generic field: {field['name']}")
                 
         except Exception as e:
             logger.warning(f"Error filling generic field: {e}")
     
+    async def _ainput(self, prompt: str = "") -> str:
+        """input() on a daemon thread so other jobs keep running while the user decides"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def settle(callback, value):
+            if not future.done():
+                callback(value)
+        
+        def read():
+            try:
+                line = input(prompt)
+            except Exception as e:
+                outcome = (future.set_exception, e)
+            else:
+                outcome = (future.set_result, line)
+            try:
+                loop.call_soon_threadsafe(settle, *outcome)
+            except RuntimeError:
+                pass  # loop already closed
+        
+        # Daemon thread: a pending prompt never holds up interpreter exit
+        threading.Thread(target=read, daemon=True).start()
+        return await future
+    
+    async def _show_page(self, page: Page):
+        """Raise this job's tab so the user reviews the form being asked about"""
+        try:
+            await page.bring_to_front()
+        except Exception as e:
+            logger.debug(f"Could not bring page to front: {e}")
+    
     async def confirm_submission(self, job: GreenhouseJob, page: Page) -> bool:
         """Ask user for confirmation before submitting application"""
+        # Another prompt may have quit while this job waited for its turn
+        if self._stop_event.is_set():
+            return False
+        
+        # Several jobs have tabs open; show the one this prompt is about
+        await self._show_page(page)
+        
         print(f"\n{'='*60}")
         print(f"🚀 READY TO SUBMIT APPLICATION")
         print(f"{'='*60}")
@@ -862,7 +1232,7 @@ Generate a CONCISE, appropriate response:"""
         
         while True:
             try:
-                choice = input("\nWhat would you like to do? [y/n/v/e/q]: ").lower().strip()
+                choice = (await self._ainput("\nWhat would you like to do? [y/n/v/e/q]: ")).lower().strip()
                 
                 if choice in ['y', 'yes']:
                     print("✅ Proceeding with submission...")
@@ -873,20 +1243,24 @@ Generate a CONCISE, appropriate response:"""
                     return False
                     
                 elif choice in ['v', 'view']:
+                    await self._show_page(page)
                     print("👁️  Check the browser window to review the form")
                     print("Press Enter when you're ready to choose an option...")
-                    input()
+                    await self._ainput()
                     continue
                     
                 elif choice in ['e', 'edit']:
+                    await self._show_page(page)
                     print("✏️  Pausing for manual editing...")
                     print("Make any changes in the browser window, then press Enter to continue...")
-                    input()
+                    await self._ainput()
                     continue
                     
                 elif choice in ['q', 'quit']:
                     print("🛑 Stopping automation")
-                    raise KeyboardInterrupt("User requested to quit")
+                    # Raising here would only end this job's task; the event stops them all
+                    self._stop_event.set()
+                    return False
                     
                 else:
                     print("❌ Invalid choice. Please enter y, n, v, e, or q")
@@ -902,24 +1276,19 @@ Generate a CONCISE, appropriate response:"""
         """Find and click the submit button"""
         logger.info("Looking for submit button...")
         
-        for selector in self.submit_selectors:
-            try:
-                button = await page.query_selector(selector)
-                if button and await button.is_visible():
-                    is_disabled = await button.get_attribute('disabled')
-                    if not is_disabled:
-                        logger.info(f"Found submit button: {selector}")
-                        
-                        await button.scroll_into_view_if_needed()
-                        await asyncio.sleep(0.5)
-                        await button.click()
-                        
-                        logger.info("Submit button clicked!")
-                        return True
-                        
-            except Exception as e:
-                logger.debug(f"Selector {selector} failed: {e}")
-                continue
+        try:
+            button = (await page.evaluate_handle(self._FIND_BUTTON_JS, self._submit_specs)).as_element()
+            if button:
+                logger.info("Found submit button")
+                
+                # click() scrolls into view and waits for the button to be stable
+                await button.click()
+                
+                logger.info("Submit button clicked!")
+                return True
+                
+        except Exception as e:
+            logger.debug(f"Submit button lookup failed: {e}")
         
         logger.error("No submit button found!")
         return False
@@ -928,20 +1297,22 @@ Generate a CONCISE, appropriate response:"""
         """Wait for submission confirmation"""
         logger.info("Waiting for submission confirmation...")
         
+        # Race the confirmation message against a success redirect; whichever
+        # lands first settles it instead of waiting out the selector timeout
+        message = asyncio.ensure_future(page.wait_for_selector(self._success_css, timeout=timeout * 1000))
+        redirect = asyncio.ensure_future(page.wait_for_url(self._success_url_re, timeout=timeout * 1000))
+        pending = {message, redirect}
+        
         try:
-            for indicator in self.success_indicators:
-                try:
-                    await page.wait_for_selector(indicator, timeout=timeout * 1000)
-                    logger.info(f"Success confirmed via: {indicator}")
-                    return True
-                except:
-                    continue
-            
-            await asyncio.sleep(3)
-            current_url = page.url
-            if 'thank' in current_url.lower() or 'success' in current_url.lower() or 'confirmation' in current_url.lower():
-                logger.info("Success inferred from URL change")
-                return True
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in done:
+                    if waiter.exception() is None:
+                        if waiter is message:
+                            logger.info("Success confirmed via confirmation message")
+                        else:
+                            logger.info("Success inferred from URL change")
+                        return True
             
             logger.warning("Could not confirm submission success")
             return False
@@ -949,18 +1320,26 @@ Generate a CONCISE, appropriate response:"""
         except Exception as e:
             logger.error(f"Error waiting for confirmation: {e}")
             return False
+        
+        finally:
+            for waiter in pending:
+                waiter.cancel()
     
     async def process_greenhouse_application(self, job: GreenhouseJob) -> bool:
         """Process a single Greenhouse application"""
         logger.info(f"Processing: {job.title} at {job.company}")
         
-        page = await self.context.new_page()
+        page = await self._acquire_page()
         
         try:
             logger.info(f"Navigating to: {job.apply_link}")
-            await page.goto(job.apply_link, wait_until='domcontentloaded', timeout=30000)
-            
-            await asyncio.sleep(2)
+            # Return once the navigation commits and wait for the form itself
+            # (or the already-applied notice) rather than for load events
+            await page.goto(job.apply_link, wait_until='commit', timeout=30000)
+            try:
+                await page.wait_for_selector(self._page_ready_css, timeout=15000)
+            except PlaywrightTimeoutError:
+                logger.debug("Application form did not appear - continuing anyway")
             
             already_applied = await page.query_selector('text=You have already applied')
             if already_applied:
@@ -974,18 +1353,22 @@ Generate a CONCISE, appropriate response:"""
             simplify_success = await self.wait_for_simplify(page)
             
             if simplify_success:
-                await asyncio.sleep(2)
+                await self.wait_for_autofill_to_settle(page)
             
             # Step 3: Fill any missing required fields
             await self.fill_missing_required_fields(page, job)
             
-            await asyncio.sleep(1)
-            
             # Step 4: Ask for user confirmation
-            should_submit = await self.confirm_submission(job, page)
+            async with self._confirm_lock:
+                should_submit = await self.confirm_submission(job, page)
+                if should_submit:
+                    self._confirmed_jobs.add(job.id)
             
             if not should_submit:
-                logger.info("User chose to skip this application")
+                if self._stop_event.is_set():
+                    logger.info("Automation stopped by user - not submitting")
+                else:
+                    logger.info("User chose to skip this application")
                 return False
             
             # Step 5: Find and click submit button
@@ -1010,7 +1393,7 @@ Generate a CONCISE, appropriate response:"""
             return False
             
         finally:
-            await page.close()
+            await self._release_page(page)
     
     async def update_notion_status(self, job_id: str, status: str):
         """Update job status in Notion"""
@@ -1025,7 +1408,7 @@ Generate a CONCISE, appropriate response:"""
         }
         
         try:
-            async with self.session.patch(url, json=payload) as response:
+            async with self._notion_semaphore, self.session.patch(url, json=payload) as response:
                 if response.status == 200:
                     logger.debug(f"Updated status for job {job_id}: {status}")
                 else:
@@ -1033,7 +1416,22 @@ Generate a CONCISE, appropriate response:"""
         except Exception as e:
             logger.warning(f"Error updating status: {e}")
     
-    async def run_automation(self, delay_between_jobs: int = 10):
+    async def queue_notion_status(self, job_id: str, status: str):
+        """Queue a status update, sending the batch once it is full"""
+        self._status_queue.append((job_id, status))
+        if len(self._status_queue) >= self._status_flush_size:
+            await self.flush_notion_statuses()
+    
+    async def flush_notion_statuses(self):
+        """Send all queued status updates concurrently over the shared session"""
+        # Notion has no bulk page update, so a batch is concurrent PATCHes
+        pending, self._status_queue = self._status_queue, []
+        if pending:
+            await asyncio.gather(*(self.update_notion_status(job_id, status) for job_id, status in pending))
+            # The cached job list predates these updates
+            await asyncio.to_thread(self._invalidate_cached_jobs)
+    
+    async def run_automation(self, delay_between_jobs: int = 10, max_concurrent_jobs: int = 4):
         """Run the complete automation"""
         try:
             await self.setup_session()
@@ -1045,31 +1443,56 @@ Generate a CONCISE, appropriate response:"""
                 logger.info("No Greenhouse jobs found to process")
                 return
             
-            logger.info(f"Starting automation for {len(jobs)} jobs")
+            logger.info(f"Starting automation for {len(jobs)} jobs ({max_concurrent_jobs} at a time)")
             
-            successful = 0
-            failed = 0
+            semaphore = asyncio.Semaphore(max_concurrent_jobs)
             
-            for i, job in enumerate(jobs, 1):
-                logger.info(f"\n--- Processing job {i}/{len(jobs)} ---")
-                
-                success = await self.process_greenhouse_application(job)
-                
-                if success:
-                    successful += 1
-                    await self.update_notion_status(job.id, "Applied")
-                else:
-                    failed += 1
-                    await self.update_notion_status(job.id, "Failed")
-                
-                if i < len(jobs):
-                    logger.info(f"Waiting {delay_between_jobs} seconds before next application...")
-                    await asyncio.sleep(delay_between_jobs)
+            async def run_job(i: int, job: GreenhouseJob) -> Optional[bool]:
+                async with semaphore:
+                    # Stagger launches once the first batch of pages is open; jitter keeps
+                    # the workers from falling into lock-step
+                    if i > max_concurrent_jobs:
+                        delay = random.uniform(delay_between_jobs * 0.5, delay_between_jobs * 1.5)
+                        logger.info(f"Waiting {delay:.1f} seconds before next application...")
+                        await asyncio.sleep(delay)
+                    
+                    logger.info(f"\n--- Processing job {i}/{len(jobs)} ---")
+                    success = await self.process_greenhouse_application(job)
+                    # A job abandoned because the user quit isn't a failure to record
+                    if not success and self._stop_event.is_set():
+                        return None
+                    await self.queue_notion_status(job.id, "Applied" if success else "Failed")
+                    return success
+            
+            tasks = [asyncio.ensure_future(run_job(i, job)) for i, job in enumerate(jobs, 1)]
+            all_jobs = asyncio.gather(*tasks)
+            stop = asyncio.ensure_future(self._stop_event.wait())
+            await asyncio.wait([all_jobs, stop], return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+            
+            if self._stop_event.is_set():
+                # Quit at a prompt: cancel the jobs not yet confirmed (pages are released in
+                # finally); confirmed ones finish submitting and queue their status
+                for job, task in zip(jobs, tasks):
+                    if job.id not in self._confirmed_jobs:
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                with contextlib.suppress(asyncio.CancelledError):
+                    await all_jobs
+            else:
+                await all_jobs  # surface a job's unexpected error as before
+            
+            results = [task.result() for task in tasks if not task.cancelled()]
+            results = [result for result in results if result is not None]
+            successful = sum(results)
+            failed = len(results) - successful
             
             logger.info(f"\n=== AUTOMATION COMPLETE ===")
             logger.info(f"Total jobs: {len(jobs)}")
             logger.info(f"Successful: {successful}")
             logger.info(f"Failed: {failed}")
+            if len(results) < len(jobs):
+                logger.info(f"Not processed (stopped by user): {len(jobs) - len(results)}")
             logger.info(f"Success rate: {successful/len(jobs)*100:.1f}%")
             
         except Exception as e:
@@ -1077,6 +1500,7 @@ Generate a CONCISE, appropriate response:"""
             
         finally:
             if self.session:
+                await self.flush_notion_statuses()
                 await self.session.close()
             if self.browser:
                 await self.browser.close()
@@ -1090,8 +1514,14 @@ async def main():
         logger.error("Please set NOTION_API_KEY and NOTION_DB_ID_TEST environment variables")
         return
     
+    # Python 3.12+: run tasks inline until their first real suspension
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     automation = GreenhouseAutomation(NOTION_TOKEN, DATABASE_ID)
     await automation.run_automation(delay_between_jobs=15)
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
\ No newline at end of file
@@ -1,57 +1,91 @@
 import re
-from bs4 import BeautifulSoup
+import hashlib
+import functools
+from collections import OrderedDict, namedtuple
+import lxml.html
+from lxml import etree
+
+# Every keyword classify_field tests for, found in one C-level scan. The zero-width
+# lookahead also reports overlapping keywords, so the result is the same set the
+# individual substring checks would find.
+FIELD_KEYWORDS = re.compile(
+    r'(?=(email|password|confirm|repeat|terms|conditions|agree|privacy|policy|first|last|name|phone))'
+)
 
 def classify_field(tag, label_text=""):
-    """Classify a form field based on its attributes and label"""
-    attrs = tag.attrs
-    name = attrs.get('name', '').lower()
-    _id = attrs.get('id', '').lower()
-    _type = attrs.get('type', '').lower()
-    placeholder = attrs.get('placeholder', '').lower()
-    automation_id = attrs.get('data-automation-id', '').lower()
+    """Classify a form field (lxml element) based on its attributes and label"""
+    attrs = tag.attrib
+    return _classify(
+        tag.tag,
+        attrs.get('name', ''),
+        attrs.get('id', ''),
+        attrs.get('type', ''),
+        attrs.get('placeholder', ''),
+        attrs.get('data-automation-id', ''),
+        label_text
+    )
+
+# Template-generated forms repeat the same attribute signatures, so most
+# fields are answered from the cache
+@functools.lru_cache(maxsize=4096)
+def _classify(tag_name, name, _id, _type, placeholder, automation_id, label_text):
+    """Classify a field from its raw attribute strings"""
+    _type = _type.lower()
+    
+    # An email input is 'email' whatever its text says, so skip building and scanning it.
+    # Other types can't short-circuit: e.g. type=password with "email" in its name is
+    # still classified 'email', and checkbox/tel outcomes depend on the text too.
+    if _type == 'email':
+        return 'email'
+    
+    name = name.lower()
+    _id = _id.lower()
+    placeholder = placeholder.lower()
+    automation_id = automation_id.lower()
     
     # Combine all text for pattern matching
     all_text = f"{name} {_id} {_type} {placeholder} {automation_id} {label_text}".lower()
+    keywords = set(FIELD_KEYWORDS.findall(all_text))
     
     # Email field
-    if 'email' in all_text or _type == 'email':
+    if 'email' in keywords:
         return 'email'
     
     # Password fields
-    if 'password' in all_text or _type == 'password':
-        if 'confirm' in all_text or 'repeat' in all_text:
+    if 'password' in keywords or _type == 'password':
+        if 'confirm' in keywords or 'repeat' in keywords:
             return 'confirm_password'
         return 'password'
     
     # Checkboxes
     if _type == 'checkbox':
-        if 'terms' in all_text or 'conditions' in all_text or 'agree' in all_text:
+        if 'terms' in keywords or 'conditions' in keywords or 'agree' in keywords:
             return 'terms_checkbox'
-        if 'privacy' in all_text or 'policy' in all_text:
+        if 'privacy' in keywords or 'policy' in keywords:
             return 'privacy_checkbox'
         return 'checkbox'
     
     # Common text fields
-    if 'first' in all_text and 'name' in all_text:
+    if 'first' in keywords and 'name' in keywords:
         return 'first_name'
-    if 'last' in all_text and 'name' in all_text:
+    if 'last' in keywords and 'name' in keywords:
         return 'last_name'
-    if 'phone' in all_text or _type == 'tel':
+    if 'phone' in keywords or _type == 'tel':
         return 'phone'
     
     # Dropdowns
-    if tag.name == 'select':
+    if tag_name == 'select':
         return 'dropdown'
     
     # Generic text input
-    if _type in ['text', ''] and tag.name == 'input':
+    if _type in ['text', ''] and tag_name == 'input':
         return 'text_input'
     
     return 'unknown'
 
 def is_required(tag, field_type):
     """Check if a field is required"""
-    attrs = tag.attrs
+    attrs = tag.attrib
     
     # Terms checkboxes are always required for signup
     if field_type == 'terms_checkbox':
@@ -59,59 +93,138 @@ def is_required(tag, field_type):
     
     return (attrs.get('required') is not None or 
             attrs.get('aria-required') == 'true' or
-            'required' in attrs.get('class', []))
+            'required' in attrs.get('class', '').split())
 
 def build_selector(tag):
     """Build a CSS selector for the field"""
-    attrs = tag.attrs
+    attrs = tag.attrib
     
     # Prefer data-automation-id
     if 'data-automation-id' in attrs:
-        return f'{tag.name}[data-automation-id="{attrs["data-automation-id"]}"]'
+        return f'{tag.tag}[data-automation-id="{attrs["data-automation-id"]}"]'
     
     # Then id
     if 'id' in attrs:
-        return f'{tag.name}[id="{attrs["id"]}"]'
+        return f'{tag.tag}[id="{attrs["id"]}"]'
     
     # Then name
     if 'name' in attrs:
-        return f'{tag.name}[name="{attrs["name"]}"]'
+        return f'{tag.tag}[name="{attrs["name"]}"]'
     
     # Then type
     if 'type' in attrs:
-        return f'{tag.name}[type="{attrs["type"]}"]'
+        return f'{tag.tag}[type="{attrs["type"]}"]'
     
-    return f'{tag.name}'
+    return f'{tag.tag}'
+
+# Parsed results for recently seen pages, keyed by a digest of the HTML
+_FIELDS_CACHE = OrderedDict()
+_FIELDS_CACHE_SIZE = 64
 
 def analyze_form_fields(html):
-    """Analyze HTML and return actionable field information"""
-    soup = BeautifulSoup(html, 'html.parser')
+    """Analyze HTML and return actionable field information.
     
-    # Map labels to their inputs
-    label_map = {}
-    for label in soup.find_all('label'):
-        if label.get('for'):
-            label_map[label['for']] = label.get_text(strip=True)
+    Fields come back column-wise: a dict of parallel lists keyed by
+    'type', 'selector', 'required', 'label' and 'tag'.
+    """
+    key = hashlib.blake2b(html.encode(), digest_size=16).digest()
     
-    # Find all form fields
-    fields = []
-    for tag in soup.find_all(['input', 'select', 'textarea']):
+    fields = _FIELDS_CACHE.get(key)
+    if fields is None:
+        fields = _parse_form_fields(html)
+        _FIELDS_CACHE[key] = fields
+        if len(_FIELDS_CACHE) > _FIELDS_CACHE_SIZE:
+            _FIELDS_CACHE.popitem(last=False)
+    else:
+        _FIELDS_CACHE.move_to_end(key)
+    
+    # Hand out copies so callers can't alter the cached entries
+    return {column: list(values) for column, values in fields.items()}
+
+def _parse_form_fields(html):
+    """Parse HTML into field information (uncached)"""
+    if not html.strip():
+        return _build_fields({}, [])
+    # lxml builds and walks the tree in C instead of BeautifulSoup's Python objects
+    root = lxml.html.fromstring(html)
+    
+    # One walk collects labels and controls; labels can follow their input,
+    # so controls are resolved against the label map afterwards
+    label_map = {}
+    controls = []
+    for tag in root.iter('label', 'input', 'select', 'textarea'):
+        if tag.tag == 'label':
+            if tag.get('for'):
+                # Same text as BeautifulSoup's get_text(strip=True)
+                label_map[tag.get('for')] = ''.join(text.strip() for text in tag.itertext())
         # Skip hidden fields
-        if tag.get('type') == 'hidden':
-            continue
+        elif tag.get('type') != 'hidden':
+            controls.append(tag)
+    
+    return _build_fields(label_map, controls)
+
+# Attributes of a control kept after its element has been freed while streaming
+_Control = namedtuple('_Control', 'tag attrib')
+
+def analyze_form_fields_file(path):
+    """Like analyze_form_fields, but streams the HTML file through the parser.
+    
+    Elements are freed as soon as they have been read, so memory follows the
+    current subtree rather than the whole document.
+    """
+    label_map = {}
+    controls = []
+    label_depth = 0
+    
+    with open(path, 'rb') as f:
+        # iterparse raises on a document with nothing in it
+        if not _has_content(f):
+            return _build_fields(label_map, controls)
         
-        label_text = label_map.get(tag.get('id', ''), '')
+        for event, element in etree.iterparse(f, events=('start', 'end'), html=True):
+            if element.tag == 'label':
+                label_depth += 1 if event == 'start' else -1
+            if event == 'start':
+                continue
+            
+            if element.tag == 'label':
+                if element.get('for'):
+                    label_map[element.get('for')] = ''.join(text.strip() for text in element.itertext())
+            elif element.tag in ('input', 'select', 'textarea') and element.get('type') != 'hidden':
+                controls.append(_Control(element.tag, dict(element.attrib)))
+            
+            # Label text is read at the label's end, so keep its children until then
+            if label_depth == 0:
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    
+    return _build_fields(label_map, controls)
+
+def _has_content(f, chunk_size=65536):
+    """Tell whether a binary file has anything besides whitespace, then rewind it"""
+    try:
+        while chunk := f.read(chunk_size):
+            if chunk.strip():
+                return True
+        return False
+    finally:
+        f.seek(0)
+
+def _build_fields(label_map, controls):
+    """Classify controls into the column-wise field layout"""
+    fields = {'type': [], 'selector': [], 'required': [], 'label': [], 'tag': []}
+    
+    # Find all form fields
+    for tag in controls:
+        label_text = label_map.get(tag.attrib.get('id', ''), '')
         field_type = classify_field(tag, label_text)
-        required = is_required(tag, field_type)
-        selector = build_selector(tag)
         
-        fields.append({
-            'type': field_type,
-            'selector': selector,
-            'required': required,
-            'label': label_text,
-            'tag': tag.name
-        })
+        fields['type'].append(field_type)
+        fields['selector'].append(build_selector(tag))
+        fields['required'].append(is_required(tag, field_type))
+        fields['label'].append(label_text)
+        fields['tag'].append(tag.tag)
     
     return fields
 
@@ -136,27 +249,24 @@ def print_actionable_fields(fields):
     print("\n📋 FIELDS TO FILL:")
     print("=" * 50)
     
-    actionable_fields = [f for f in fields if f['type'] in actionable_types]
+    actionable = [i for i, field_type in enumerate(fields['type']) if field_type in actionable_types]
     
-    if not actionable_fields:
+    if not actionable:
         print("❌ No actionable fields found")
         return
     
-    for field in actionable_fields:
-        icon = actionable_types.get(field['type'], '📝')
-        required_text = " (REQUIRED)" if field['required'] else " (OPTIONAL)"
-        label_text = f" - {field['label']}" if field['label'] else ""
+    for i in actionable:
+        icon = actionable_types.get(fields['type'][i], '📝')
+        required_text = " (REQUIRED)" if fields['required'][i] else " (OPTIONAL)"
+        label_text = f" - {fields['label'][i]}" if fields['label'][i] else ""
         
-        print(f"{icon}: {field['selector']}{required_text}{label_text}")
+        print(f"{icon}: {fields['selector'][i]}{required_text}{label_text}")
 
 # Example usage - integrate this with your existing code
 def main():
     # Read the HTML file your script created
     try:
-        with open("page_dump.html", "r", encoding="utf-8") as f:
-            html = f.read()
-        
-        fields = analyze_form_fields(html)
+        fields = analyze_form_fields_file("page_dump.html")
         print_actionable_fields(fields)
         
     except FileNotFoundError:
@@ -1,6 +1,11 @@
 import asyncio
+import os
+import re
+import functools
+from collections import namedtuple
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import lxml.html
 
 # Test data for form filling
 TEST_DATA = {
@@ -12,24 +17,47 @@ TEST_DATA = {
     'phone': '555-123-4567'
 }
 
+# Every keyword classify_field tests for, found in one C-level scan. The zero-width
+# lookahead also reports overlapping keywords, so the result is the same set the
+# individual substring checks would find.
+FIELD_KEYWORDS = re.compile(
+    r'(?=(beecatcher|honeypot|trap|bot|email|password|verify|confirm|repeat|terms|conditions|agree|first|last|name|phone))'
+)
+HONEYPOT_KEYWORDS = frozenset(['beecatcher', 'honeypot', 'trap', 'bot'])
+
 def classify_field(tag, label_text=""):
-    """Classify a form field based on its attributes and label"""
-    attrs = tag.attrs
-    name = attrs.get('name', '').lower()
-    _id = attrs.get('id', '').lower()
-    _type = attrs.get('type', '').lower()
-    placeholder = attrs.get('placeholder', '').lower()
-    automation_id = attrs.get('data-automation-id', '').lower()
+    """Classify a form field (lxml element) based on its attributes and label"""
+    attrs = tag.attrib
+    return _classify(
+        attrs.get('name', ''),
+        attrs.get('id', ''),
+        attrs.get('type', ''),
+        attrs.get('placeholder', ''),
+        attrs.get('data-automation-id', ''),
+        label_text
+    )
+
+# Re-analysis after navigation or a retry sees the same attribute signatures,
+# so those fields are answered from the cache
+@functools.lru_cache(maxsize=4096)
+def _classify(name, _id, _type, placeholder, automation_id, label_text):
+    """Classify a field from its raw attribute strings"""
+    name = name.lower()
+    _id = _id.lower()
+    _type = _type.lower()
+    placeholder = placeholder.lower()
+    automation_id = automation_id.lower()
     
     # Combine all text for pattern matching
     all_text = f"{name} {_id} {_type} {placeholder} {automation_id} {label_text}".lower()
+    keywords = set(FIELD_KEYWORDS.findall(all_text))
     
     # Skip honeypot fields
-    if any(keyword in all_text for keyword in ['beecatcher', 'honeypot', 'trap', 'bot']):
+    if not HONEYPOT_KEYWORDS.isdisjoint(keywords):
         return 'honeypot'
     
     # Email field
-    if 'email' in all_text or _type == 'email':
+    if 'email' in keywords or _type == 'email':
         return 'email'
     
     # Password fields - check specific automation IDs first
@@ -37,8 +65,8 @@ def classify_field(tag, label_text=""):
         return 'password'
     if automation_id == 'verifypassword':
         return 'confirm_password'
-    if 'password' in all_text or _type == 'password':
-        if 'verify' in all_text or 'confirm' in all_text or 'repeat' in all_text:
+    if 'password' in keywords or _type == 'password':
+        if 'verify' in keywords or 'confirm' in keywords or 'repeat' in keywords:
             return 'confirm_password'
         return 'password'
     
@@ -46,62 +74,107 @@ def classify_field(tag, label_text=""):
     if _type == 'checkbox':
         if automation_id == 'createaccountcheckbox':
             return 'terms_checkbox'
-        if 'terms' in all_text or 'conditions' in all_text or 'agree' in all_text:
+        if 'terms' in keywords or 'conditions' in keywords or 'agree' in keywords:
             return 'terms_checkbox'
         return 'checkbox'
     
     # Common text fields
-    if 'first' in all_text and 'name' in all_text:
+    if 'first' in keywords and 'name' in keywords:
         return 'first_name'
-    if 'last' in all_text and 'name' in all_text:
+    if 'last' in keywords and 'name' in keywords:
         return 'last_name'
-    if 'phone' in all_text or _type == 'tel':
+    if 'phone' in keywords or _type == 'tel':
         return 'phone'
     
     return 'unknown'
 
 def build_selector(tag):
     """Build a CSS selector for the field"""
-    attrs = tag.attrs
+    attrs = tag.attrib
     
     # Prefer data-automation-id
     if 'data-automation-id' in attrs:
-        return f'{tag.name}[data-automation-id="{attrs["data-automation-id"]}"]'
+        return f'{tag.tag}[data-automation-id="{attrs["data-automation-id"]}"]'
     
     # Then id
     if 'id' in attrs:
-        return f'{tag.name}[id="{attrs["id"]}"]'
+        return f'{tag.tag}[id="{attrs["id"]}"]'
     
     # Then name
     if 'name' in attrs:
-        return f'{tag.name}[name="{attrs["name"]}"]'
+        return f'{tag.tag}[name="{attrs["name"]}"]'
     
-    return f'{tag.name}'
+    return f'{tag.tag}'
 
 def analyze_form_fields(html):
     """Analyze HTML and return actionable field information"""
-    soup = BeautifulSoup(html, 'html.parser')
+    if not html.strip():
+        return []
+    # lxml builds and walks the tree in C instead of BeautifulSoup's Python objects
+    root = lxml.html.fromstring(html)
     
-    # Map labels to their inputs
+    # One walk collects labels and controls; labels can follow their input,
+    # so controls are resolved against the label map afterwards
     label_map = {}
-    for label in soup.find_all('label'):
-        if label.get('for'):
-            label_map[label['for']] = label.get_text(strip=True)
+    controls = []
+    for tag in root.iter('label', 'input', 'select', 'textarea'):
+        if tag.tag == 'label':
+            if tag.get('for'):
+                # Same text as BeautifulSoup's get_text(strip=True)
+                label_map[tag.get('for')] = ''.join(text.strip() for text in tag.itertext())
+        # Skip hidden fields
+        elif tag.get('type') != 'hidden':
+            controls.append(tag)
     
-    # Find actionable form fields
-    fields = []
-    fillable_types = ['email', 'password', 'confirm_password', 'terms_checkbox', 'first_name', 'last_name', 'phone']
+    return _build_fields(label_map, controls)
+
+# A control read out of the live page, shaped like the lxml element classify_field expects
+_Control = namedtuple('_Control', 'tag attrib')
+
+# Collects labels and visible-type controls in the browser, so the page doesn't
+# have to be serialized and re-parsed in Python
+_EXTRACT_FIELDS_JS = """
+() => {
+    const labels = {};
+    for (const label of document.querySelectorAll('label[for]')) {
+        const forId = label.getAttribute('for');
+        if (!forId) continue;
+        // Same text as BeautifulSoup's get_text(strip=True)
+        const walker = document.createTreeWalker(label, NodeFilter.SHOW_TEXT);
+        let text = '';
+        while (walker.nextNode()) text += walker.currentNode.nodeValue.trim();
+        labels[forId] = text;
+    }
     
-    for tag in soup.find_all(['input', 'select', 'textarea']):
-        # Skip hidden fields
-        if tag.get('type') == 'hidden':
-            continue
-        
-        label_text = label_map.get(tag.get('id', ''), '')
+    const keep = ['name', 'id', 'type', 'placeholder', 'data-automation-id'];
+    const controls = [];
+    for (const el of document.querySelectorAll('input, select, textarea')) {
+        if (el.getAttribute('type') === 'hidden') continue;
+        const attrib = {};
+        for (const attr of keep) {
+            if (el.hasAttribute(attr)) attrib[attr] = el.getAttribute(attr);
+        }
+        controls.push({tag: el.tagName.toLowerCase(), attrib});
+    }
+    return {labels, controls};
+}
+"""
+
+async def analyze_page_fields(page):
+    """Like analyze_form_fields, but reads the fields straight from the live page"""
+    result = await page.evaluate(_EXTRACT_FIELDS_JS)
+    controls = [_Control(control['tag'], control['attrib']) for control in result['controls']]
+    return _build_fields(result['labels'], controls)
+
+def _build_fields(label_map, controls):
+    """Classify controls and keep the ones we can fill"""
+    fields = []
+    for tag in controls:
+        label_text = label_map.get(tag.attrib.get('id', ''), '')
         field_type = classify_field(tag, label_text)
         
         # Only keep fields we can fill
-        if field_type in fillable_types:
+        if field_type in FILL_ACTIONS:
             selector = build_selector(tag)
             fields.append({
                 'type': field_type,
@@ -111,9 +184,35 @@ def analyze_form_fields(html):
     
     return fields
 
-async def highlight_element(element, color='green'):
-    """Add a colored border to an element for visual verification"""
-    await element.evaluate(f'element => element.style.border = "3px solid {color}"')
+# Border filled fields for manual inspection; set DEBUG_HIGHLIGHT=0 to skip (e.g. headless)
+DEBUG_HIGHLIGHT = os.getenv('DEBUG_HIGHLIGHT', '1') != '0'
+
+async def highlight_selectors(page, selectors, color='green'):
+    """Add a colored border to each selector's first match, in one round trip"""
+    if not DEBUG_HIGHLIGHT or not selectors:
+        return
+    await page.evaluate(
+        """([selectors, color]) => selectors.forEach(selector => {
+            const element = document.querySelector(selector);
+            if (element) element.style.border = `3px solid ${color}`;
+        })""",
+        [selectors, color]
+    )
+
+# How long (ms) a fill waits for its field to become actionable
+FILL_TIMEOUT = 2000
+
+# How each fillable field type is handled: (action, value, log name), with
+# 'fill' values resolved from TEST_DATA once here rather than on every fill
+FILL_ACTIONS = {
+    'email': ('fill', TEST_DATA['email'], 'Email'),
+    'password': ('fill', TEST_DATA['password'], 'Password'),
+    'confirm_password': ('fill', TEST_DATA['confirm_password'], 'Confirm password'),
+    'terms_checkbox': ('check', None, 'Terms checkbox'),
+    'first_name': ('fill', TEST_DATA['first_name'], 'First name'),
+    'last_name': ('fill', TEST_DATA['last_name'], 'Last name'),
+    'phone': ('fill', TEST_DATA['phone'], 'Phone')
+}
 
 async def fill_field_by_type(page, field):
     """Fill a field based on its type"""
@@ -123,48 +222,23 @@ async def fill_field_by_type(page, field):
     print(f"\n🔍 Classifying field: {field_type} -> {field['selector']}")
     
     try:
+        # fill/check wait for the element to be visible themselves, so a short
+        # timeout replaces a separate is_visible() round trip
         element = page.locator(selector).first
-        if not await element.is_visible():
-            return False
         
-        if field_type == 'email':
-            await element.fill(TEST_DATA['email'])
-            await highlight_element(element)
-            print(f"✅ Email filled: {TEST_DATA['email']}")
-            
-        elif field_type == 'password':
-            await element.fill(TEST_DATA['password'])
-            await highlight_element(element)
-            print(f"✅ Password filled: {TEST_DATA['password']}")
-            
-        elif field_type == 'confirm_password':
-            await element.fill(TEST_DATA['confirm_password'])
-            await highlight_element(element)
-            print(f"✅ Confirm password filled: {TEST_DATA['confirm_password']}")
-            
-        elif field_type == 'terms_checkbox':
-            if not await element.is_checked():
-                await element.check()
-            await highlight_element(element)
-            print(f"✅ Terms checkbox checked")
-            
-        elif field_type == 'first_name':
-            await element.fill(TEST_DATA['first_name'])
-            await highlight_element(element)
-            print(f"✅ First name filled: {TEST_DATA['first_name']}")
-            
-        elif field_type == 'last_name':
-            await element.fill(TEST_DATA['last_name'])
-            await highlight_element(element)
-            print(f"✅ Last name filled: {TEST_DATA['last_name']}")
-            
-        elif field_type == 'phone':
-            await element.fill(TEST_DATA['phone'])
-            await highlight_element(element)
-            print(f"✅ Phone filled: {TEST_DATA['phone']}")
+        action, value, label = FILL_ACTIONS.get(field_type, (None, None, None))
+        if action == 'check':
+            await element.check(timeout=FILL_TIMEOUT)  # no-op if already checked
+            print(f"✅ {label} checked")
+        elif action == 'fill':
+            await element.fill(value, timeout=FILL_TIMEOUT)
+            print(f"✅ {label} filled: {value}")
         
         return True
         
+    except PlaywrightTimeoutError:
+        # Not visible/actionable in time, same as a hidden field
+        return False
     except Exception as e:
         print(f"❌ Failed to fill {field_type}: {selector}")
         return False
@@ -173,11 +247,8 @@ async def dynamic_fill_form(page):
     """Dynamically analyze and fill form fields"""
     print("🔍 Analyzing page for form fields...")
     
-    # Get current page HTML
-    html = await page.content()
-    
-    # Analyze fields
-    fields = analyze_form_fields(html)
+    # Analyze fields in the page itself
+    fields = await analyze_page_fields(page)
     
     if not fields:
         print("❌ No fillable fields found")
@@ -189,14 +260,109 @@ async def dynamic_fill_form(page):
     
     print("\n🖊️  Filling fields...")
     
-    # Fill each field
-    filled_count = 0
+    # Fields sharing a selector resolve to the same element, so fill each
+    # selector once (first field wins)
+    unique_fields = {}
     for field in fields:
+        unique_fields.setdefault(field['selector'], field)
+    
+    # One at a time: fill() focuses the element and then types, and focus is
+    # shared by the whole page, so concurrent fills could land in the wrong field
+    filled = []
+    for selector, field in unique_fields.items():
         if await fill_field_by_type(page, field):
-            filled_count += 1
-        await asyncio.sleep(500)  # Small delay between fills
+            filled.append(selector)
+    filled_count = len(filled)
+    await highlight_selectors(page, filled)
+    
+    print(f"\n✅ Successfully filled {filled_count}/{len(unique_fields)} fields")
+
+class BrowserPool:
+    """Keeps one Chromium alive and hands out a fresh context per job.
+    
+    With a CDP URL it attaches to a long-running Chromium (started with
+    --remote-debugging-port) instead of launching one, so caches and
+    connections stay warm between runs.
+    """
     
-    print(f"\n✅ Successfully filled {filled_count}/{len(fields)} fields")
+    def __init__(self, cdp_url=None, headless=False):
+        self.cdp_url = cdp_url
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+    
+    async def start(self):
+        """Launch or connect to the browser (no-op if already up)"""
+        if self.browser is not None:
+            return
+        self.playwright = await async_playwright().start()
+        if self.cdp_url:
+            print(f"🔌 Connecting to running browser: {self.cdp_url}")
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url)
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+    
+    async def new_context(self):
+        """Hand out an isolated context; far cheaper than a new browser"""
+        await self.start()
+        return await self.browser.new_context()
+    
+    async def close(self):
+        """Close a launched browser, or just disconnect from a CDP one"""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+# Only the form's DOM matters, so these are never worth downloading. Stylesheets
+# stay: visibility checks (and honeypots hidden by CSS) depend on them.
+BLOCKED_RESOURCE_TYPES = frozenset(['image', 'font', 'media'])
+
+async def block_heavy_resources(route):
+    """Abort requests for resources the automation never looks at"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+browser_pool = BrowserPool(cdp_url=os.getenv('CHROME_CDP_URL'))
+
+# Present once the application form has rendered
+FORM_READY_SELECTOR = 'input[type=email], input[data-automation-id="email"]'
+
+async def wait_for_any(page, selectors, timeout):
+    """Wait until any of the selectors is visible; False on timeout"""
+    try:
+        await page.wait_for_selector(', '.join(selectors), state='visible', timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def click_first_visible(page, selectors, timeout):
+    """Click the first visible match of any selector; False if none shows up in time"""
+    # Playwright's CSS engine accepts :has-text/:visible inside selector lists,
+    # so one click waits on all of them instead of probing each in turn
+    css = ', '.join(f'{selector}:visible' for selector in selectors)
+    try:
+        await page.locator(css).first.click(timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def wait_for_form_or_new_tab(page, context, timeout=15000):
+    """Wait until the form renders on page or another tab opens, whichever is first"""
+    waiters = [
+        asyncio.ensure_future(wait_for_any(page, [FORM_READY_SELECTOR], timeout)),
+        asyncio.ensure_future(context.wait_for_event('page', timeout=timeout)),
+    ]
+    done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in pending:
+        waiter.cancel()
+    # Retrieve the outcome so a timed-out waiter doesn't log an unhandled error
+    for waiter in done:
+        waiter.exception()
 
 async def main():
     # Get job URL from user
@@ -206,89 +372,69 @@ async def main():
         print("❌ Please provide a valid job URL")
         return
     
-    async with async_playwright() as p:
-        # Launch browser
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        page = await context.new_page()
+    # Fresh context from the shared (or already running) browser
+    context = await browser_pool.new_context()
+    await context.route('**/*', block_heavy_resources)
+    page = await context.new_page()
+    
+    try:
+        print(f"🌐 Navigating to: {job_url}")
+        await page.goto(job_url, wait_until='domcontentloaded')
         
-        try:
-            print(f"🌐 Navigating to: {job_url}")
-            await page.goto(job_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # Step 1: Click Apply button
-            print("🔍 Looking for Apply button...")
-            apply_selectors = [
-                'button:has-text("Apply")',
-                'button:has-text("Apply Now")',
-                'a:has-text("Apply")',
-                'a:has-text("Apply Now")',
-                '[data-automation-id*="apply"]'
-            ]
-            
-            apply_clicked = False
-            for selector in apply_selectors:
-                try:
-                    apply_button = page.locator(selector).first
-                    if await apply_button.is_visible():
-                        await apply_button.click()
-                        print("✅ Apply button clicked")
-                        apply_clicked = True
-                        break
-                except:
-                    continue
-            
-            if not apply_clicked:
-                print("❌ Apply button not found")
-                return
-            
-            await page.wait_for_timeout(3000)
-            
-            # Step 2: Handle modal if it appears
-            print("🔍 Checking for modal...")
-            modal_selectors = [
-                'a[data-automation-id="applyManually"]',
-                'button:has-text("Apply Manually")',
-                '[data-automation-id="applyManually"]'
-            ]
-            
-            for selector in modal_selectors:
-                try:
-                    modal_button = page.locator(selector).first
-                    if await modal_button.is_visible():
-                        await modal_button.click()
-                        print("✅ Apply Manually clicked")
-                        break
-                except:
-                    continue
-            
-            await page.wait_for_timeout(3000)
-            
-            # Step 3: Handle new tab if opened
-            if len(context.pages) > 1:
-                page = context.pages[-1]
-                await page.bring_to_front()
-                print("✅ Switched to new tab")
-                await page.wait_for_load_state('networkidle')
-            
-            # Step 4: Dynamic form filling
-            await dynamic_fill_form(page)
-            
-            print("\n🎉 Automation complete!")
-            print("📋 Fields have been filled and highlighted.")
-            print("🔍 Please inspect the form manually before proceeding.")
-            print("⏸️  Script paused - press Ctrl+C to exit when ready.")
-            
-            # Keep browser open for manual inspection
-            while True:
-                await asyncio.sleep(1)
-                
-        except KeyboardInterrupt:
-            print("\n👋 Exiting...")
+        # Step 1: Click Apply button
+        print("🔍 Looking for Apply button...")
+        apply_selectors = [
+            'button:has-text("Apply")',
+            'button:has-text("Apply Now")',
+            'a:has-text("Apply")',
+            'a:has-text("Apply Now")',
+            '[data-automation-id*="apply"]'
+        ]
+        # Tracker-heavy pages rarely go network-idle; the button is all we need
+        if not await click_first_visible(page, apply_selectors, timeout=15000):
+            print("❌ Apply button not found")
+            return
+        print("✅ Apply button clicked")
+        
+        # Step 2: Handle modal if it appears
+        print("🔍 Checking for modal...")
+        modal_selectors = [
+            'a[data-automation-id="applyManually"]',
+            'button:has-text("Apply Manually")',
+            '[data-automation-id="applyManually"]'
+        ]
+        if await click_first_visible(page, modal_selectors, timeout=5000):
+            print("✅ Apply Manually clicked")
+        
+        # The form shows up either on this page or in a new tab
+        if len(context.pages) == 1:
+            await wait_for_form_or_new_tab(page, context)
+        
+        # Step 3: Handle new tab if opened
+        if len(context.pages) > 1:
+            page = context.pages[-1]
+            await page.bring_to_front()
+            print("✅ Switched to new tab")
+            await wait_for_any(page, [FORM_READY_SELECTOR], timeout=15000)
         
-        finally:
-            await browser.close()
+        # Step 4: Dynamic form filling
+        await dynamic_fill_form(page)
+        
+        print("\n🎉 Automation complete!")
+        print("📋 Fields have been filled and highlighted.")
+        print("🔍 Please inspect the form manually before proceeding.")
+        print("⏸️  Script paused - press Ctrl+C to exit when ready.")
+        
+        # Keep browser open for manual inspection; a future that never
+        # completes idles without waking the loop until Ctrl+C cancels it
+        await asyncio.get_running_loop().create_future()
+            
+    except KeyboardInterrupt:
+        print("\n👋 Exiting...")
+    
+    finally:
+        await context.close()
+        await browser_pool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
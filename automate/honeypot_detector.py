@@ -1,3 +1,26 @@
+import re
+
+try:
+    import ahocorasick
+except ImportError:  # optional: keyword automaton for honeypot scans
+    ahocorasick = None
+
+def _keyword_scanner(keywords):
+    """Return a function telling whether a text contains any of the keywords.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, else one
+    precompiled regex alternation; either way the text is scanned once.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
 class HoneypotDetector:
     """Class to detect and skip honeypot/bot trap fields"""
     
@@ -14,90 +37,115 @@ class HoneypotDetector:
             'verify', 'check', 'confirm', 'repeat', 'validation',
             'password', 'email', 'username', 'name', 'phone'
         ]
+        
+        # Only flag password fields as honeypots if they have very specific honeypot indicators
+        self.strict_honeypot_keywords = ['beecatcher', 'honeypot', 'bot', 'trap', 'fake', 'spam']
+        
+        self._has_honeypot_keyword = _keyword_scanner(self.honeypot_keywords)
+        self._has_strict_honeypot_keyword = _keyword_scanner(self.strict_honeypot_keywords)
+        self._has_legitimate_keyword = _keyword_scanner(self.legitimate_keywords)
+    
+    # Everything is_honeypot_field looks at, read in one round trip
+    _PROBE_JS = '''
+        element => {
+            const style = window.getComputedStyle(element);
+            const rect = element.getBoundingClientRect();
+            return {
+                automationId: element.getAttribute('data-automation-id') || '',
+                name: element.getAttribute('name') || '',
+                id: element.getAttribute('id') || '',
+                className: element.getAttribute('class') || '',
+                placeholder: element.getAttribute('placeholder') || '',
+                type: element.getAttribute('type') || '',
+                tabindex: element.getAttribute('tabindex'),
+                hidden: style.display === 'none' || 
+                        style.visibility === 'hidden' || 
+                        style.opacity === '0' ||
+                        element.style.display === 'none' ||
+                        element.style.visibility === 'hidden' ||
+                        element.offsetHeight === 0 ||
+                        element.offsetWidth === 0,
+                rect: {
+                    left: rect.left,
+                    top: rect.top,
+                    width: rect.width,
+                    height: rect.height
+                }
+            };
+        }
+    '''
+    
+    # Same probe mapped over every match of a selector. Always shipped with the
+    # call, never kept on window, so the page under test can't replace it
+    _PROBE_ALL_JS = f'elements => elements.map({_PROBE_JS.strip()})'
+    
+    # Controls classify_all looks at by default
+    FIELD_SELECTOR = 'input:not([type=hidden]), select, textarea'
     
     async def is_honeypot_field(self, element):
         """Check if a field is a honeypot/bot trap field"""
         try:
-            # Get element attributes
-            automation_id = await element.get_attribute('data-automation-id') or ''
-            name = await element.get_attribute('name') or ''
-            _id = await element.get_attribute('id') or ''
-            class_name = await element.get_attribute('class') or ''
-            placeholder = await element.get_attribute('placeholder') or ''
-            field_type = await element.get_attribute('type') or ''
-            
-            # Combine all attributes for checking
-            all_attrs = f"{automation_id} {name} {_id} {class_name} {placeholder}".lower()
-            
-            # Special handling for password fields - be more lenient
-            if field_type == 'password':
-                # Only flag password fields as honeypots if they have very specific honeypot indicators
-                strict_honeypot_keywords = ['beecatcher', 'honeypot', 'bot', 'trap', 'fake', 'spam']
-                if any(keyword in all_attrs for keyword in strict_honeypot_keywords):
-                    print(f"🚨 Password field flagged as honeypot: {all_attrs}")
-                    return True
-            else:
-                # For non-password fields, use the full honeypot keyword list
-                if any(keyword in all_attrs for keyword in self.honeypot_keywords):
-                    # But first check if it contains legitimate keywords
-                    has_legitimate = any(keyword in all_attrs for keyword in self.legitimate_keywords)
-                    if has_legitimate:
-                        print(f"🔍 Field has honeypot keywords but also legitimate ones: {all_attrs}")
-                        # Only flag as honeypot if it has honeypot keywords AND is hidden
-                    else:
-                        print(f"🚨 Field flagged as honeypot by keywords: {all_attrs}")
-                        return True
-            
-            # Check if field is hidden via CSS
-            is_hidden = await element.evaluate('''
-                element => {
-                    const style = window.getComputedStyle(element);
-                    return style.display === 'none' || 
-                           style.visibility === 'hidden' || 
-                           style.opacity === '0' ||
-                           element.style.display === 'none' ||
-                           element.style.visibility === 'hidden' ||
-                           element.offsetHeight === 0 ||
-                           element.offsetWidth === 0;
-                }
-            ''')
-            
-            if is_hidden:
-                print(f"🚨 Field flagged as honeypot (hidden): {all_attrs}")
-                return True
-            
-            # Check for suspicious positioning (off-screen)
-            position = await element.evaluate('''
-                element => {
-                    const rect = element.getBoundingClientRect();
-                    return {
-                        left: rect.left,
-                        top: rect.top,
-                        width: rect.width,
-                        height: rect.height
-                    };
-                }
-            ''')
-            
-            # Field positioned way off screen or has zero dimensions
-            if (position['left'] < -1000 or position['top'] < -1000 or 
-                position['width'] == 0 or position['height'] == 0):
-                print(f"🚨 Field flagged as honeypot (off-screen): {all_attrs}")
-                return True
-            
-            # Additional check: if field has tabindex="-1" it might be a honeypot
-            tabindex = await element.get_attribute('tabindex')
-            if tabindex == '-1':
-                print(f"🚨 Field flagged as honeypot (tabindex=-1): {all_attrs}")
-                return True
-                
-            return False
+            info = await element.evaluate(self._PROBE_JS)
+            return self._is_honeypot(info)
             
         except Exception as e:
             print(f"❌ Error checking honeypot status: {e}")
             # If we can't determine, err on the side of caution and assume it's legitimate
             return False
     
+    async def classify_all(self, page, selector=FIELD_SELECTOR):
+        """Check every field matching selector in one round trip.
+        
+        Returns one flag per match, aligned with page.locator(selector).nth(i).
+        """
+        try:
+            infos = await page.eval_on_selector_all(selector, self._PROBE_ALL_JS)
+        except Exception as e:
+            print(f"❌ Error checking honeypot status: {e}")
+            return []
+        return [self._is_honeypot(info) for info in infos]
+    
+    def _is_honeypot(self, info):
+        """Decide from the probed field info whether it's a honeypot"""
+        # Combine all attributes for checking
+        all_attrs = f"{info['automationId']} {info['name']} {info['id']} {info['className']} {info['placeholder']}".lower()
+        
+        # Special handling for password fields - be more lenient
+        if info['type'] == 'password':
+            if self._has_strict_honeypot_keyword(all_attrs):
+                print(f"🚨 Password field flagged as honeypot: {all_attrs}")
+                return True
+        else:
+            # For non-password fields, use the full honeypot keyword list
+            if self._has_honeypot_keyword(all_attrs):
+                # But first check if it contains legitimate keywords
+                has_legitimate = self._has_legitimate_keyword(all_attrs)
+                if has_legitimate:
+                    print(f"🔍 Field has honeypot keywords but also legitimate ones: {all_attrs}")
+                    # Only flag as honeypot if it has honeypot keywords AND is hidden
+                else:
+                    print(f"🚨 Field flagged as honeypot by keywords: {all_attrs}")
+                    return True
+        
+        # Check if field is hidden via CSS
+        if info['hidden']:
+            print(f"🚨 Field flagged as honeypot (hidden): {all_attrs}")
+            return True
+        
+        # Field positioned way off screen or has zero dimensions
+        position = info['rect']
+        if (position['left'] < -1000 or position['top'] < -1000 or 
+            position['width'] == 0 or position['height'] == 0):
+            print(f"🚨 Field flagged as honeypot (off-screen): {all_attrs}")
+            return True
+        
+        # Additional check: if field has tabindex="-1" it might be a honeypot
+        if info['tabindex'] == '-1':
+            print(f"🚨 Field flagged as honeypot (tabindex=-1): {all_attrs}")
+            return True
+            
+        return False
+    
     async def safe_fill_field(self, element, value, field_type="field"):
         """Safely fill a field after checking if it's a honeypot"""
         # Get field info for debugging
@@ -1,7 +1,6 @@
 import asyncio
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-import re
+import lxml.html
 
 async def fetch_html(url):
     async with async_playwright() as p:
@@ -14,34 +13,46 @@ async def fetch_html(url):
         return html
 
 def extract_form_fields(html):
-    soup = BeautifulSoup(html, 'html.parser')
-
     print("🔍 Detected form fields:\n")
     
-    # Map labels to their associated inputs
+    # Map labels to their associated inputs. lxml parses in C, and one walk
+    # collects labels and fields; fields print afterwards since a label can
+    # come after its input
     label_map = {}
-    for label in soup.find_all('label'):
-        if label.get('for'):
-            label_map[label['for']] = label.get_text(strip=True)
-
-    for tag in soup.find_all(['input', 'select', 'textarea']):
-        tag_type = tag.name
-        attrs = tag.attrs
+    fields = []
+    if html.strip():
+        for tag in lxml.html.fromstring(html).iter('label', 'input', 'select', 'textarea'):
+            if tag.tag == 'label':
+                if tag.get('for'):
+                    # Same text as BeautifulSoup's get_text(strip=True)
+                    label_map[tag.get('for')] = ''.join(text.strip() for text in tag.itertext())
+            else:
+                fields.append(tag)
+
+    for tag in fields:
+        tag_type = tag.tag
+        attrs = tag.attrib
         name = attrs.get('name', '')
         _id = attrs.get('id', '')
-        _type = attrs.get('type', '') if tag.name == 'input' else ''
+        _type = attrs.get('type', '') if tag.tag == 'input' else ''
         placeholder = attrs.get('placeholder', '')
         label = label_map.get(_id, '')
 
         print(f"- [{tag_type.upper()}] name='{name}', id='{_id}', type='{_type}', placeholder='{placeholder}', label='{label}'")
 
+def write_dump(html, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
 async def main():
     url = "https://job-boards.eu.greenhouse.io/arenaai/jobs/4552967101"  # 🔁 Replace with the Workday signup page
-    html = await fetch_html(url)
-
-    with open("page_dump.html", "w", encoding="utf-8") as f:
-        f.write(html)
-    
-    extract_form_fields(html)
+    html = await fetch_html(url)  # browser is already closed before parsing
+
+    # Write the dump and parse the same string on two worker threads, so the write
+    # starts right away instead of once the parse has finished
+    await asyncio.gather(
+        asyncio.to_thread(write_dump, html, "page_dump.html"),
+        asyncio.to_thread(extract_form_fields, html),
+    )
 
 asyncio.run(main())
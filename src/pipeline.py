@@ -1,11 +1,16 @@
 # pipeline.py
 
-import schedule
 import time
-import subprocess
+import asyncio
 import sys
 import os
-import shutil
+import runpy
+import signal
+import logging
+import contextlib
+import io
+import traceback
+import gzip
 from datetime import datetime
 from pathlib import Path
 import argparse # New import for command-line flags
@@ -20,81 +25,241 @@ SCRIPT_NAMES = {
     "analyzer": "analyze/analyze.py"
 }
 
+# Resolved once at startup so stages don't re-stat their script on every run
+SCRIPT_PATHS = {name: str(Path(path).resolve()) for name, path in SCRIPT_NAMES.items()}
+MISSING_SCRIPTS = {name for name, path in SCRIPT_PATHS.items() if not os.path.isfile(path)}
+
+# Component log locations, with file name patterns compiled once
+COMPONENT_LOGS = {
+    "condenser": ("condensed/log", re.compile(r"^log_.*\.txt$")),
+    "filter": ("filtered/log", re.compile(r"^log_.*\.txt$")),
+    "analyzer": ("analyze/log", re.compile(r"^enhanced_run_.*\.log$"))
+}
+
+# Run stages inside this interpreter instead of spawning a new python per stage.
+# Set to False to fall back to one subprocess per stage.
+RUN_STAGES_IN_PROCESS = True
+STAGE_TIMEOUT = 1800  # 30 minute timeout per stage
+STAGE_DELAY = 0  # Seconds to wait between stages
+
 # Create logs directory
 os.makedirs("logs", exist_ok=True)
 
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+LOG_FLUSH_BATCH = 128  # Log records written between flushes of the scheduler log
+
+logger = logging.getLogger("pipeline")
+
+_BANNER = "=" * 50
+_SUMMARY_BANNER = "=" * 60
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp within the same second"""
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cached_second = None
+        self._cached_time = ""
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_time = time.strftime(self.datefmt, time.localtime(second))
+        return self._cached_time
+
+class _BatchFlushHandler(logging.StreamHandler):
+    """StreamHandler that flushes once per LOG_FLUSH_BATCH records instead of per record.
+
+    The pipeline also flushes the stream at every stage boundary.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._pending = 0
+
+    def flush(self):
+        self._pending += 1
+        if self._pending >= LOG_FLUSH_BATCH:
+            self._pending = 0
+            super().flush()
+
 def setup_logging():
-    """Setup logging for the scheduler"""
+    """Setup logging for the scheduler.
+
+    Returns the log stream, which stage output is also written to.
+    """
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file_path = f"logs/scheduler_log_{timestamp}.txt"
-    return open(log_file_path, "w", encoding="utf-8")
-
-def log_message(message: str, log_file=None):
-    """Log message with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    formatted_message = f"[{timestamp}] {message}"
-    print(formatted_message)
-    if log_file:
-        log_file.write(formatted_message + "\n")
-        log_file.flush()
-
-def run_script(script_name, log_file, test_mode=False, no_explanation=False):
-    """Run a Python script and capture its output, passing --test flag if needed."""
-    script_path = SCRIPT_NAMES[script_name]
+    log_file_path = f"logs/scheduler_log_{timestamp}.txt.gz"
+    # Level 1 gzip is cheap and shrinks log text several times over; the
+    # stream is flushed at stage boundaries and on close rather than per line
+    log_file = gzip.open(log_file_path, "wt", encoding="utf-8", compresslevel=1)
+    
+    formatter = _CachedTimeFormatter("[%(asctime)s] %(message)s", datefmt=LOG_DATEFMT)
+    logger.handlers.clear()  # Drop handlers left over from a previous run
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in (_BatchFlushHandler(log_file), logging.StreamHandler(sys.stdout)):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return log_file
+
+class StageTimeout(BaseException):
+    """Raised when an in-process stage exceeds STAGE_TIMEOUT.
+
+    Derives from BaseException so a stage's own `except Exception` blocks
+    cannot swallow it.
+    """
+
+def _raise_stage_timeout(signum, frame):
+    raise StageTimeout()
+
+def _run_in_process(script_path, args):
+    """Execute a stage script in this interpreter, as `python script_path args` would.
+
+    Returns (exit code, captured stdout, captured stderr), like subprocess.run
+    with capture_output=True.
+    """
+    saved_argv = sys.argv
+    saved_path = sys.path[:]
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    saved_level = root_logger.level
+
+    # Each stage calls logging.basicConfig(), which is a no-op once the root
+    # logger has handlers, so give every stage a clean root logger.
+    root_logger.handlers = []
+    sys.argv = [script_path, *args]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+
+    use_alarm = hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_stage_timeout)
+        signal.alarm(STAGE_TIMEOUT)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            runpy.run_path(script_path, run_name="__main__")
+        return 0, stdout.getvalue(), stderr.getvalue()
+    except SystemExit as e:
+        if e.code is None:
+            return 0, stdout.getvalue(), stderr.getvalue()
+        if isinstance(e.code, int):
+            return e.code, stdout.getvalue(), stderr.getvalue()
+        stderr.write(f"{e.code}\n")
+        return 1, stdout.getvalue(), stderr.getvalue()
+    except Exception:
+        # What the interpreter would have printed had the stage run as a child
+        stderr.write(traceback.format_exc())
+        return 1, stdout.getvalue(), stderr.getvalue()
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        for handler in root_logger.handlers:
+            handler.close()
+        root_logger.handlers = saved_handlers
+        root_logger.setLevel(saved_level)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+
+async def _drain(reader, log_file):
+    """Copy a child process stream into the log file line by line."""
+    async for line in reader:
+        log_file.write(line.decode("utf-8", errors="replace"))
+
+async def _run_subprocess(script_path, args, log_file):
+    """Run a stage script in a child process, streaming its output to the log file.
+
+    The log is gzip-compressed, so the child writes to a pipe that is drained
+    into it rather than to the log's file descriptor. Returns the exit code.
+    """
+    # close_fds=False lets CPython launch the child with posix_spawn (vfork)
+    # instead of fork+exec; our own fds are non-inheritable by default anyway.
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, script_path, *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        close_fds=False
+    )
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(_drain(process.stdout, log_file), process.wait()),
+            timeout=STAGE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode
+
+async def run_script(script_name, log_file, test_mode=False, no_explanation=False):
+    """Run a pipeline stage and capture its output, passing --test flag if needed."""
+    script_path = SCRIPT_PATHS[script_name]
     
-    if not os.path.exists(script_path):
-        log_message(f"❌ Script {script_path} not found!", log_file)
+    if script_name in MISSING_SCRIPTS:
+        logger.info(f"❌ Script {script_path} not found!")
         return False
     
-    log_message(f"🚀 Starting {script_name} ({script_path})...", log_file)
+    logger.info(f"🚀 Starting {script_name} ({script_path})...")
     
-    # === CHANGE: Build the command dynamically ===
-    command = [sys.executable, script_path]
+    # === CHANGE: Build the arguments dynamically ===
+    args = []
     if script_name == "scraper" and test_mode:
-        command.append('--test')
-        log_message("   -> Running scraper in TEST mode.", log_file)
+        args.append('--test')
+        logger.info("   -> Running scraper in TEST mode.")
     if script_name == "analyzer" and no_explanation:
-        command.append('--no-explanation')
-        log_message("   -> Running analyzer with no explanations.", log_file)
+        args.append('--no-explanation')
+        logger.info("   -> Running analyzer with no explanations.")
     
     try:
-        result = subprocess.run(
-            command, # Use the dynamically built command
-            capture_output=True,
-            text=True,
-            timeout=1800  # 30 minute timeout
-        )
+        if RUN_STAGES_IN_PROCESS:
+            returncode, output, errors = _run_in_process(script_path, args)
+        else:
+            # A child's output is streamed into the log as it runs instead
+            output = errors = ""
+            log_file.write(f"--- output of {script_name} ---\n")
+            try:
+                returncode = await _run_subprocess(script_path, args, log_file)
+            finally:
+                log_file.write(f"--- end of {script_name} output ---\n")
         
-        if result.returncode == 0:
-            log_message(f"✅ {script_name} completed successfully", log_file)
-            if result.stdout:
-                log_message(f"📄 Output: {result.stdout.strip()}", log_file)
+        if returncode == 0:
+            logger.info(f"✅ {script_name} completed successfully")
+            if output:
+                logger.info(f"📄 Output: {output.strip()}")
             return True
         else:
-            log_message(f"❌ {script_name} failed with return code {result.returncode}", log_file)
-            if result.stderr:
-                log_message(f"📄 Error: {result.stderr.strip()}", log_file)
+            logger.info(f"❌ {script_name} failed with return code {returncode}")
+            if errors:
+                logger.info(f"📄 Error: {errors.strip()}")
             return False
             
-    except subprocess.TimeoutExpired:
-        log_message(f"⏰ {script_name} timed out after 30 minutes", log_file)
+    except (asyncio.TimeoutError, StageTimeout):
+        logger.info(f"⏰ {script_name} timed out after 30 minutes")
         return False
     except Exception as e:
-        log_message(f"❌ Error running {script_name}: {str(e)}", log_file)
+        logger.info(f"❌ Error running {script_name}: {str(e)}")
         return False
 
 def get_latest_log_file(log_dir, pattern):
-    """Get the most recent log file from a directory."""
+    """Get the most recent log file from a directory.
+
+    `pattern` is a compiled regex matched against file names.
+    """
     try:
-        log_path = Path(log_dir)
-        if not log_path.exists():
-            return None
+        # One scandir pass: each entry is matched and stat'ed exactly once
+        latest, latest_mtime = None, None
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if not pattern.match(entry.name) or not entry.is_file(follow_symlinks=False):
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                if latest is None or mtime > latest_mtime:
+                    latest, latest_mtime = entry, mtime
         
-        log_files = list(log_path.glob(pattern))
-        if not log_files:
-            return None
-            
-        return max(log_files, key=os.path.getmtime)
+        return Path(latest.path) if latest else None
     except Exception:
         return None
 
@@ -265,63 +430,61 @@ def extract_component_summary(component_name, log_file_path):
     except Exception as e:
         return f"   ❌ {component_name}: Error reading logs - {e}"
 
-def generate_pipeline_summary(log_file):
+def generate_pipeline_summary():
     """Generate comprehensive pipeline summary with component details."""
-    log_message("\n" + "=" * 60, log_file)
-    log_message("📊 DETAILED PIPELINE SUMMARY", log_file)
-    log_message("=" * 60, log_file)
-    
-    # Component log locations
-    component_logs = {
-        "condenser": ("condensed/log", "log_*.txt"),
-        "filter": ("filtered/log", "log_*.txt"),
-        "analyzer": ("analyze/log", "enhanced_run_*.log")
-    }
+    logger.info("\n" + _SUMMARY_BANNER)
+    logger.info("📊 DETAILED PIPELINE SUMMARY")
+    logger.info(_SUMMARY_BANNER)
     
     # Extract summaries from each component
-    for component, (log_dir, pattern) in component_logs.items():
+    for component, (log_dir, pattern) in COMPONENT_LOGS.items():
         latest_log = get_latest_log_file(log_dir, pattern)
         summary = extract_component_summary(component, latest_log)
-        log_message(summary, log_file)
+        logger.info(summary)
     
-    log_message("=" * 60, log_file)
+    logger.info(_SUMMARY_BANNER)
 
-def run_complete_pipeline(test_mode=False, no_explanation=False):
+async def run_complete_pipeline(test_mode=False, no_explanation=False):
     """Run the complete job processing pipeline."""
     log_file = setup_logging()
     
-    log_message("=" * 50, log_file)
-    if test_mode:
-        log_message("🔄 STARTING AUTOMATED JOB PIPELINE (TEST MODE)", log_file)
-    else:
-        log_message("🔄 STARTING AUTOMATED JOB PIPELINE (LIVE MODE)", log_file)
-    if no_explanation:
-        log_message("   -> Analyzer will skip explanations", log_file)
-    log_message("=" * 50, log_file)
-    
-    pipeline_steps = ["scraper", "condenser", "filter", "analyzer"]
-    success_count = 0
-    
-    for step in pipeline_steps:
-        # Pass the test_mode and no_explanation flags to the run_script function
-        if run_script(step, log_file, test_mode, no_explanation):
-            success_count += 1
+    try:
+        logger.info(_BANNER)
+        if test_mode:
+            logger.info("🔄 STARTING AUTOMATED JOB PIPELINE (TEST MODE)")
         else:
-            log_message(f"🛑 Pipeline stopped at {step} due to failure", log_file)
-            break
-        time.sleep(2) # Short delay
-    
-    log_message("=" * 50, log_file)
-    if success_count == len(pipeline_steps):
-        log_message("🎉 PIPELINE COMPLETED SUCCESSFULLY!", log_file)
+            logger.info("🔄 STARTING AUTOMATED JOB PIPELINE (LIVE MODE)")
+        if no_explanation:
+            logger.info("   -> Analyzer will skip explanations")
+        logger.info(_BANNER)
         
-        # Generate detailed component summary
-        generate_pipeline_summary(log_file)
-    else:
-        log_message(f"⚠️ PIPELINE PARTIALLY COMPLETED ({success_count}/{len(pipeline_steps)} steps)", log_file)
-    log_message("=" * 50, log_file)
-    
-    log_file.close()
+        pipeline_steps = ["scraper", "condenser", "filter", "analyzer"]
+        success_count = 0
+        
+        for step in pipeline_steps:
+            # Pass the test_mode and no_explanation flags to the run_script function
+            stage_ok = await run_script(step, log_file, test_mode, no_explanation)
+            log_file.flush()  # Stage boundary
+            if stage_ok:
+                success_count += 1
+            else:
+                logger.info(f"🛑 Pipeline stopped at {step} due to failure")
+                break
+            if STAGE_DELAY:
+                await asyncio.sleep(STAGE_DELAY)
+        
+        logger.info(_BANNER)
+        if success_count == len(pipeline_steps):
+            logger.info("🎉 PIPELINE COMPLETED SUCCESSFULLY!")
+            
+            # Generate detailed component summary
+            generate_pipeline_summary()
+        else:
+            logger.info(f"⚠️ PIPELINE PARTIALLY COMPLETED ({success_count}/{len(pipeline_steps)} steps)")
+        logger.info(_BANNER)
+    finally:
+        logger.handlers.clear()
+        log_file.close()
 
 def main():
     """Main scheduler function that accepts command-line arguments."""
@@ -329,6 +492,7 @@ def main():
     parser = argparse.ArgumentParser(description="Run the job processing pipeline.")
     parser.add_argument('--test', action='store_true', help='Run the pipeline in test mode.')
     parser.add_argument('--no-explanation', action='store_true', help='Skip AI-generated explanations in analyzer.')
+    parser.add_argument('--interval-hours', type=float, help='Keep running and repeat the pipeline every N hours.')
     args = parser.parse_args()
 
     if args.test:
@@ -338,12 +502,37 @@ def main():
     
     if args.no_explanation:
         print("📝 Analyzer will skip explanations.")
+    
+    if MISSING_SCRIPTS:
+        for name in sorted(MISSING_SCRIPTS):
+            print(f"❌ Script {SCRIPT_PATHS[name]} not found!")
+        sys.exit(1)
         
-    print("🔧 Running pipeline once manually...")
-    print()
+    if not args.interval_hours:
+        print("🔧 Running pipeline once manually...")
+        print()
+        
+        # Pass the test and no_explanation flags to the pipeline runner
+        asyncio.run(run_complete_pipeline(test_mode=args.test, no_explanation=args.no_explanation))
+        return
     
-    # Pass the test and no_explanation flags to the pipeline runner
-    run_complete_pipeline(test_mode=args.test, no_explanation=args.no_explanation)
+    # Sleep straight until the next run instead of polling
+    interval = args.interval_hours * 3600
+    print(f"⏰ Running pipeline every {args.interval_hours:g} hours (Ctrl+C to stop)...")
+    print()
+    next_run = time.monotonic()
+    try:
+        while True:
+            delay = next_run - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            asyncio.run(run_complete_pipeline(test_mode=args.test, no_explanation=args.no_explanation))
+            next_run += interval
+            if next_run < time.monotonic():
+                # Skip runs missed while a run overran or the machine slept
+                next_run = time.monotonic() + interval
+    except KeyboardInterrupt:
+        print("\n🛑 Scheduler stopped")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file